@@ -1,61 +1,94 @@
 # Top of file imports
+import hashlib
 import logging
 from typing import Optional
 
 # Module imports and event stubs
-from .dto import AgentGuardrail, CoreAgentContext
+from .dto import AgentGuardrail, CoreAgentContext, _enum_str
 try:
     from events.agent_event_spec import AgentEventSpec
     from events.event_util import EventUtil
+    _EVENTS_ENABLED = True
 except Exception:
+    _EVENTS_ENABLED = False
+
     class AgentEventSpec:
         class EventType:
             on_guardrail_validate_start = "on_guardrail_validate_start"
             on_guardrail_validate_end = "on_guardrail_validate_end"
 
     class EventUtil:
+        @staticmethod
+        def has_listeners(event_type) -> bool:
+            return False
+
         @staticmethod
         def emit(event_type, session_id=None, event_params=None):
             # No-op when events system is not present
             return
 
+# Texts at or above this length are emitted as a digest plus preview instead of inline
+_MAX_INLINE = 4096
+_PREVIEW_CHARS = 256
+
+
+def _payload_text(s: str) -> dict:
+    if len(s) < _MAX_INLINE:
+        return {"text": s}
+    return {"sha256": hashlib.sha256(s.encode()).hexdigest(), "length": len(s), "preview": s[:_PREVIEW_CHARS]}
+
+
+def _has_listeners(event_type) -> bool:
+    """Ask the event system whether anyone subscribes; assume yes if it cannot say."""
+    check = getattr(EventUtil, "has_listeners", None)
+    return True if check is None else bool(check(event_type))
+
+
+def _agent_id(context: CoreAgentContext) -> Optional[str]:
+    metadata = getattr(context, "agent_metadata", None)
+    return metadata.id if metadata else None
+
+
 class Guardrail:
     def __init__(self, config: AgentGuardrail) -> None:
         self.config = config
+        # Config is invariant for the instance; build the event identity once
+        self._gr_ident = {
+            "id": config.id,
+            "type": _enum_str(config.type),
+            "scope": _enum_str(config.scope),
+            "pattern": config.pattern,
+        }
 
     def _emit_start(self, context: CoreAgentContext, user_input: str) -> None:
+        event_type = AgentEventSpec.EventType.on_guardrail_validate_start
+        if not _EVENTS_ENABLED or not _has_listeners(event_type):
+            return
         EventUtil.emit(
-            AgentEventSpec.EventType.on_guardrail_validate_start,
+            event_type,
             session_id=context.session_id,
             event_params={
-                "agent_id": context.agent_metadata.id if getattr(context, "agent_metadata", None) else None,
-                "guardrail": {
-                    "id": getattr(self.config, "id", None),
-                    "type": (self.config.type.value if hasattr(self.config.type, "value") else str(self.config.type)),
-                    "scope": (
-                        self.config.scope.value if hasattr(self.config.scope, "value") else str(self.config.scope)),
-                    "pattern": getattr(self.config, "pattern", None),
-                },
-                "input": user_input,
+                "agent_id": _agent_id(context),
+                "guardrail": self._gr_ident,
+                "input": _payload_text(user_input),
             },
         )
 
     def _emit_end(self, context: CoreAgentContext, original_input: str, result_text: str,
                   details: Optional[dict] = None) -> None:
+        event_type = AgentEventSpec.EventType.on_guardrail_validate_end
+        if not _EVENTS_ENABLED or not _has_listeners(event_type):
+            return
+        input_payload = _payload_text(original_input)
         EventUtil.emit(
-            AgentEventSpec.EventType.on_guardrail_validate_end,
+            event_type,
             session_id=context.session_id,
             event_params={
-                "agent_id": context.agent_metadata.id if getattr(context, "agent_metadata", None) else None,
-                "guardrail": {
-                    "id": getattr(self.config, "id", None),
-                    "type": (self.config.type.value if hasattr(self.config.type, "value") else str(self.config.type)),
-                    "scope": (
-                        self.config.scope.value if hasattr(self.config.scope, "value") else str(self.config.scope)),
-                    "pattern": getattr(self.config, "pattern", None),
-                },
-                "input": original_input,
-                "result": result_text,
+                "agent_id": _agent_id(context),
+                "guardrail": self._gr_ident,
+                "input": input_payload,
+                # Pass-through results share the input payload rather than being encoded twice
+                "result": input_payload if result_text is original_input else _payload_text(result_text),
                 "details": details or {},
             },
         )
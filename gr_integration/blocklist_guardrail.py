@@ -1,16 +1,44 @@
 # Top of file imports
 import logging
 import re
-from typing import List, Dict
+from typing import List, Dict, Optional
 
-from .dto import CoreAgentContext
+from .dto import CoreAgentContext, _norm
 from .base_guardrail import Guardrail, GuardrailConfig
+from .hs_scan import HYPERSCAN_ENABLED, build_database
+from .regex_guardrail import _compile
+
+try:
+    import ahocorasick  # pyahocorasick; optional
+except ImportError:
+    ahocorasick = None
 
 
 def _parse_words(prompt: str) -> List[str]:
     return [w.strip().lower() for w in re.split(r"[,\n]", prompt or "") if w.strip()]
 
 
+# Length-preserving lowercase for ASCII-only word lists: A-Z plus every non-ASCII character
+# that re.IGNORECASE matches against an ASCII letter (dotted/dotless i, long s, Kelvin sign)
+_ASCII_FOLD = str.maketrans(
+    {
+        **{chr(c): chr(c + 32) for c in range(ord("A"), ord("Z") + 1)},
+        "\u0130": "i", "\u0131": "i", "\u017f": "s", "\u212a": "k",
+    }
+)
+
+
+def _is_word_char(c: str) -> bool:
+    return c.isalnum() or c == "_"
+
+
+def _at_boundary(text: str, i: int) -> bool:
+    """Mirror regex \\b: a word/non-word transition at position i."""
+    before = i > 0 and _is_word_char(text[i - 1])
+    after = i < len(text) and _is_word_char(text[i])
+    return before != after
+
+
 class BlocklistGuardrail(Guardrail):
     """Blocklist-based guardrail.
 
@@ -18,26 +46,73 @@ class BlocklistGuardrail(Guardrail):
     Emits match details in the end event.
     """
 
+    def __init__(self, config: GuardrailConfig) -> None:
+        super().__init__(config)
+        self._words = _parse_words(getattr(config, "pattern", ""))
+        self._scope_label = _norm(self._gr_ident["scope"]) or "both"
+        self._ascii_only = all(w.isascii() for w in self._words)
+        # One word-boundary regex per word, built on first regex-path validate
+        self._compiled: Optional[List["re.Pattern[str]"]] = None
+        # One automaton over all words when pyahocorasick is installed
+        self._ac = None
+        if ahocorasick is not None and self._words:
+            ac = ahocorasick.Automaton()
+            for w in self._words:
+                ac.add_word(w, (len(w), w))
+            ac.make_automaton()
+            self._ac = ac
+        # Opt-in Hyperscan database; its \b and caseless matching are ASCII-only
+        self._hs = None
+        if HYPERSCAN_ENABLED and self._words:
+            self._hs = build_database([rf"\b{re.escape(w)}\b" for w in self._words], som=True)
+
+    def _word_patterns(self) -> List["re.Pattern[str]"]:
+        if self._compiled is None:
+            # Stdlib re: word boundaries must be Unicode-aware (RE2's \b is ASCII-only), and
+            # escaped literals cannot backtrack badly anyway
+            self._compiled = [_compile(rf"\b{re.escape(w)}\b", re.IGNORECASE) for w in self._words]
+        return self._compiled
+
+    def _scan_automaton(self, user_input: str, lower_text: str) -> List[Dict]:
+        matches: List[Dict] = []
+        for end_idx, (length, _w) in self._ac.iter(lower_text):
+            start, end = end_idx - length + 1, end_idx + 1
+            if _at_boundary(lower_text, start) and _at_boundary(lower_text, end):
+                matches.append({"start": start, "end": end, "value": user_input[start:end]})
+        return matches
+
     def validate(self, context: CoreAgentContext, user_input: str) -> str:
         self._emit_start(context, user_input)
-        words = _parse_words(getattr(self.config, "pattern", ""))
-        scope_str = (
-            self.config.scope.value if hasattr(self.config.scope, "value") else str(self.config.scope or "both")
-        ).strip().lower()
         # Log which guardrail is running
         logging.getLogger(__name__).info(
-            "Executing BlocklistGuardrail: words=%d, scope=%s", len(words), scope_str
+            "Executing BlocklistGuardrail: words=%d, scope=%s", len(self._words), self._scope_label
         )
+        if self._hs is not None and user_input.isascii():
+            # ASCII text: byte offsets from the scan are character offsets
+            matches = [
+                {"start": s, "end": e, "value": user_input[s:e]}
+                for _i, s, e in self._hs.scan(user_input.encode())
+            ]
+            self._emit_end(context, user_input, user_input, details={"type": "blocklist", "matches": matches})
+            return user_input
+
+        if user_input.isascii():
+            lower_text = user_input.lower()
+        elif self._ascii_only:
+            # Other characters can never be part of an ASCII word, so only fold what could match
+            lower_text = user_input.translate(_ASCII_FOLD)
+        else:
+            lower_text = user_input.lower()
+        # Offsets from the lowered text are only valid when lowering kept the length
+        if self._ac is not None and len(lower_text) == len(user_input):
+            matches = self._scan_automaton(user_input, lower_text)
+            self._emit_end(context, user_input, user_input, details={"type": "blocklist", "matches": matches})
+            return user_input
+
         matches: List[Dict] = []
-        lower_text = user_input.lower()
-        for w in words:
+        for pattern in self._word_patterns():
             # Word boundary search
-            pattern = re.compile(rf"\b{re.escape(w)}\b", flags=re.IGNORECASE)
             for m in pattern.finditer(user_input):
                 matches.append({"start": m.start(), "end": m.end(), "value": m.group(0)})
-            # Fallback substring search
-            if w in lower_text and not any(s["value"].lower() == w for s in matches):
-                idx = lower_text.find(w)
-                matches.append({"start": idx, "end": idx + len(w), "value": user_input[idx: idx + len(w)]})
         self._emit_end(context, user_input, user_input, details={"type": "blocklist", "matches": matches})
         return user_input
@@ -3,6 +3,16 @@ from enum import Enum
 from typing import Any, Dict, Optional, Union
 
 
+def _enum_str(x: Any) -> str:
+    """Return an enum's value, or str(x) for plain values ("" for None)."""
+    return x.value if isinstance(x, Enum) else ("" if x is None else str(x))
+
+
+def _norm(s: Optional[str]) -> str:
+    """Strip and lower-case a config string once ("" for None)."""
+    return (s or "").strip().lower()
+
+
 class GuardrailsScope(Enum):
     INPUT = "input"
     OUTPUT = "output"
@@ -20,18 +30,18 @@ class GuardrailsType(Enum):
     PII = "pii"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class AgentMetadata:
     id: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class CoreAgentContext:
     session_id: Optional[str] = None
     agent_metadata: Optional[AgentMetadata] = None
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class AgentGuardrail:
     id: Optional[str] = None
     type: Union[str, GuardrailsType] = "regex_match"
@@ -18,9 +18,7 @@ def _normalize_type_key(type_key: Union[str, GuardrailsType]) -> str:
         key = str(type_key.value or "").strip().lower()
     else:
         key = str(type_key or "").strip().lower()
-    if "." in key:
-        key = key.split(".")[-1]
-    return key
+    return key.rpartition(".")[2]
 
 
 def _import_class(path: str) -> Type[Guardrail]:
@@ -1,23 +1,95 @@
 # Top of file imports
 import logging
+import threading
 
-from typing import List
+from typing import Dict, Hashable, List, Optional, Tuple
 
+from .base_guardrail import Guardrail
 from .dto import AgentGuardrail, GuardrailsScope
 from .guardrail_factory import get_default_factory
 
+_PLAN_CACHE_SIZE = 128
+_INSTANCE_CACHE_SIZE = 512
+
+
+def _config_key(gr: AgentGuardrail) -> Optional[Hashable]:
+    """Hashable identity of a guardrail config, or None when params are not hashable."""
+    params = gr.params
+    try:
+        frozen = tuple(sorted(params.items())) if isinstance(params, dict) else params
+        key = (gr.id, gr.type, gr.scope, gr.hub_id, gr.pattern, gr.on_fail, frozen)
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
 
 class GuardrailsService:
+    def __init__(self) -> None:
+        self._factory = get_default_factory()
+        # config ids -> (configs, per-scope instances); configs are held so their ids stay unique
+        self._plans: Dict[tuple, Tuple[tuple, Dict[GuardrailsScope, Tuple[Guardrail, ...]]]] = {}
+        # Equal configs share one instance, so per-request AgentGuardrail objects reuse compiled state
+        self._instance_cache: Dict[Hashable, Guardrail] = {}
+        # Hits are lock-free dict reads; misses fill the caches under this lock (re-entrant: plans create instances)
+        self._lock = threading.RLock()
+
     def validate(self, agent_context, guardrails: List[AgentGuardrail], user_input: str, scope: GuardrailsScope) -> str:
         """Validate text against guardrails filtered by the provided scope.
 
         Runs only those guardrails whose `scope` matches the provided `scope` or is BOTH.
         Returns (potentially modified) text.
         """
+        if not guardrails:
+            return user_input
         text = user_input
-        for gr in guardrails or []:
-            gr_scope = getattr(gr, "scope", GuardrailsScope.BOTH)
-            if gr_scope in (scope, GuardrailsScope.BOTH):
-                instance = self._create_guardrail(gr)
-                text = instance.validate(agent_context, text)
+        for instance in self._plan(guardrails, scope):
+            text = instance.validate(agent_context, text)
         return text
+
+    def _plan(self, guardrails: List[AgentGuardrail], scope: GuardrailsScope) -> Tuple[Guardrail, ...]:
+        """Return instantiated guardrails applicable to scope, memoized per guardrails list.
+
+        The first call for a list buckets it for every scope, preserving list order.
+        """
+        items = tuple(guardrails)
+        key = tuple(map(id, items))
+        hit = self._plans.get(key)
+        if hit is None:
+            with self._lock:
+                hit = self._plans.get(key)
+                if hit is None:
+                    scoped = [(getattr(gr, "scope", GuardrailsScope.BOTH), self._create_guardrail(gr)) for gr in items]
+                    buckets = {
+                        sc: tuple(inst for gr_scope, inst in scoped if gr_scope in (sc, GuardrailsScope.BOTH))
+                        for sc in GuardrailsScope
+                    }
+                    if len(self._plans) >= _PLAN_CACHE_SIZE:
+                        self._plans.clear()
+                    hit = self._plans[key] = (items, buckets)
+        plan = hit[1].get(scope)
+        if plan is None:
+            # Scope passed as a plain value rather than an enum member
+            with self._lock:
+                plan = hit[1].get(scope)
+                if plan is None:
+                    plan = hit[1][scope] = tuple(
+                        self._create_guardrail(gr)
+                        for gr in items
+                        if getattr(gr, "scope", GuardrailsScope.BOTH) in (scope, GuardrailsScope.BOTH)
+                    )
+        return plan
+
+    def _create_guardrail(self, gr: AgentGuardrail) -> Guardrail:
+        key = _config_key(gr)
+        if key is None:
+            return self._factory.create(gr)
+        instance = self._instance_cache.get(key)
+        if instance is None:
+            with self._lock:
+                instance = self._instance_cache.get(key)
+                if instance is None:
+                    if len(self._instance_cache) >= _INSTANCE_CACHE_SIZE:
+                        self._instance_cache.clear()
+                    instance = self._instance_cache[key] = self._factory.create(gr)
+        return instance
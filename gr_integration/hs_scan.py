@@ -0,0 +1,64 @@
+# Top of file imports
+import logging
+import os
+import threading
+from typing import List, Optional, Sequence, Tuple
+
+# Hyperscan is optional and opt-in; callers fall back to re/RE2 without it
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+# Set GUARDRAILS_HYPERSCAN=1 to scan PII and blocklist patterns with one Hyperscan database
+HYPERSCAN_ENABLED = hyperscan is not None and os.getenv("GUARDRAILS_HYPERSCAN", "").strip().lower() in (
+    "1", "true", "yes", "on"
+)
+
+
+class HyperscanDatabase:
+    """A block-mode database over several patterns; pattern ids are list positions.
+
+    Scratch space is not safe to share between concurrent scans, so each thread
+    allocates its own on first use.
+    """
+
+    def __init__(self, db) -> None:
+        self._db = db
+        self._local = threading.local()
+
+    def scan(self, data: bytes) -> List[Tuple[int, int, int]]:
+        """Return (pattern id, start, end) byte offsets for every match."""
+        scratch = getattr(self._local, "scratch", None)
+        if scratch is None:
+            scratch = self._local.scratch = hyperscan.Scratch(self._db)
+        hits: List[Tuple[int, int, int]] = []
+        self._db.scan(data, match_event_handler=_collect, context=hits, scratch=scratch)
+        return hits
+
+
+def _collect(pattern_id, start, end, flags, hits):
+    hits.append((pattern_id, start, end))
+
+
+def build_database(patterns: Sequence[str], som: bool = False) -> Optional[HyperscanDatabase]:
+    """Compile patterns case-insensitively, or return None when Hyperscan is off or rejects them.
+
+    With som=True matches carry leftmost start offsets; otherwise each pattern
+    reports at most once, which is enough to tell which patterns occur.
+    """
+    if not HYPERSCAN_ENABLED or not patterns:
+        return None
+    flag = hyperscan.HS_FLAG_CASELESS | (hyperscan.HS_FLAG_SOM_LEFTMOST if som else hyperscan.HS_FLAG_SINGLEMATCH)
+    db = hyperscan.Database(mode=hyperscan.HS_MODE_BLOCK)
+    try:
+        db.compile(
+            expressions=[p.encode() for p in patterns],
+            ids=list(range(len(patterns))),
+            elements=len(patterns),
+            flags=[flag] * len(patterns),
+        )
+    except hyperscan.error as e:
+        logging.getLogger(__name__).warning("Hyperscan database unavailable, using re fallback: %s", e)
+        return None
+    return HyperscanDatabase(db)
@@ -24,12 +24,15 @@ try:
     GUARDRAILS_AVAILABLE = True
 except Exception as e:
     import logging, sys, importlib.util
-    logging.getLogger(__name__).warning(
-        "Guardrails import failed; Hub unavailable. exe=%s err=%s dateutil_spec=%s",
-        sys.executable, e, importlib.util.find_spec("dateutil"),
-    )
-    for p in sys.path[:10]:
-        logging.getLogger(__name__).warning("sys.path sample: %s", p)
+    lg = logging.getLogger(__name__)
+    # Diagnostics are only computed when they will actually be emitted
+    if lg.isEnabledFor(logging.WARNING):
+        lg.warning(
+            "Guardrails import failed; Hub unavailable. exe=%s err=%s dateutil_spec=%s",
+            sys.executable, e, importlib.util.find_spec("dateutil"),
+        )
+    if lg.isEnabledFor(logging.DEBUG):
+        lg.debug("sys.path head: %s", sys.path[:10])
     GUARDRAILS_AVAILABLE = False
 
 import warnings
@@ -40,155 +43,326 @@ warnings.filterwarnings(
     module="guardrails.validator_service"
 )
 
+import asyncio
+import importlib
 import logging
+import threading
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+from .dto import _norm
+from .regex_guardrail import _compile
 
 logging.getLogger("presidio-analyzer").setLevel(logging.ERROR)
+_LOG = logging.getLogger(__name__)
+_APP_LOG = logging.getLogger("gr_integration.app")
+_LOG.setLevel(logging.INFO)
+
+
+# Process-wide caches for the availability probe and resolved validator classes
+_HAS_VALIDATE: Optional[bool] = None
+_RESOLVE_CACHE: Dict[Tuple[str, str], Any] = {}
+# Returned by the uncached resolver when hub.load raised; such misses may be transient
+_LOAD_FAILED = object()
+_HUB_MODULES: Optional[tuple] = None
+# Validator config keys that are never forwarded to Guard().use as params
+_RESERVED_KEYS = frozenset({"type", "scope", "hub_id", "pattern", "on_fail", "params"})
+_GUARD_CACHE_SIZE = 256
+# Per-thread marker that an event loop has been set up for guardrails
+_LOOP_READY = threading.local()
+
+
+def _hub_modules():
+    """Import guardrails.hub / guardrails.validators once and reuse them."""
+    global _HUB_MODULES
+    if _HUB_MODULES is None:
+        mods = []
+        for name in ("guardrails.hub", "guardrails.validators"):
+            try:
+                mods.append(importlib.import_module(name))
+            except Exception:
+                mods.append(None)
+        _HUB_MODULES = tuple(mods)
+    return _HUB_MODULES
+
+
+def _resolve_hub_cls(type_raw: str, hub_id: str):
+    """Resolve the validator class for normalized (type, hub_id), memoized per pair.
+
+    Not-found misses are cached as None so repeated lookups do not retry hub.load;
+    a hub.load that raised (network, auth) is not cached and is retried next time.
+    A hub_id alone decides the class, so the type is left out of the key when one is given.
+    """
+    key = ("" if hub_id else type_raw, hub_id)
+    if key in _RESOLVE_CACHE:
+        return _RESOLVE_CACHE[key]
+    cls = _resolve_hub_cls_uncached(type_raw, hub_id)
+    if cls is _LOAD_FAILED:
+        return None
+    _RESOLVE_CACHE[key] = cls
+    return cls
+
+
+@lru_cache(maxsize=256)
+def _candidates_for(slug_or_type: str) -> Tuple[str, ...]:
+    """Attribute names to try for a hub slug or validator type."""
+    s = slug_or_type.replace("-", "_")
+    base = s.rpartition("/")[2].rpartition(":")[2]
+    return (
+        f"guardrails.validators.{base}",
+        f"guardrails.hub.{base}",
+        base,
+    )
+
+
+def _resolve_hub_cls_uncached(type_raw: str, hub_id: str):
+    lg = _LOG
+    hub_mod, validators_mod = _hub_modules()
+
+    names = _candidates_for(hub_id or type_raw)
+    for mod in (hub_mod, validators_mod):
+        if mod:
+            for name in names:
+                cls = getattr(mod, name, None)
+                if cls:
+                    lg.info(
+                        "HubAdapter: resolved class=%s from module=%s for type=%s hub_id=%s",
+                        getattr(cls, "__name__", str(cls)),
+                        getattr(mod, "__name__", "(unknown)"),
+                        type_raw or "(none)",
+                        hub_id or "(none)"
+                    )
+                    return cls
+
+    # Direct plugin import fallback (if package is present locally)
+    try:
+        base_slug = (hub_id or type_raw).rpartition("/")[2].replace("-", "_")
+        plugin_mod_name = f"guardrails_grhub_{base_slug}"
+        plugin_mod = importlib.import_module(plugin_mod_name)
+        for name in names:
+            cls = getattr(plugin_mod, name, None)
+            if cls:
+                lg.info(
+                    "HubAdapter: resolved class=%s from plugin=%s for type=%s hub_id=%s",
+                    getattr(cls, "__name__", str(cls)),
+                    plugin_mod_name,
+                    type_raw or "(none)",
+                    hub_id or "(none)"
+                )
+                return cls
+    except Exception:
+        pass
+
+    # Dynamic load via Guardrails Hub (requires GUARDRAILS_API_KEY)
+    if hub_mod and (hub_id or type_raw):
+        try:
+            loader = getattr(hub_mod, "load", None)
+            if callable(loader):
+                target = hub_id or f"guardrails/{base_slug}"
+                loaded = loader(target) or loader(f"hub://{target}")
+                if loaded:
+                    lg.info(
+                        "HubAdapter: resolved via dynamic hub.load target=%s class=%s",
+                        target,
+                        getattr(loaded, "__name__", str(loaded))
+                    )
+                    return loaded
+        except Exception as e:
+            lg.warning("Dynamic Hub load failed for %s: %s", (hub_id or type_raw), e)
+            return _LOAD_FAILED
+    return None
+
+
+def read_manifest(path: str) -> List[Dict[str, str]]:
+    """Turn a hub_validators.txt manifest (one hub:// URI per line) into validator configs."""
+    configs: List[Dict[str, str]] = []
+    with open(path, encoding="utf-8") as fh:
+        for line in fh:
+            uri = line.strip()
+            if uri and not uri.startswith("#"):
+                configs.append({"hub_id": uri.removeprefix("hub://")})
+    return configs
+
+
+class ValidatorColumns:
+    """Struct-of-arrays view of a validators_config list, with the hot fields pre-normalized.
+
+    Build it once per config list and pass it to run/run_many in place of the list.
+    """
+
+    __slots__ = ("configs", "types", "scopes", "hub_ids", "patterns")
+
+    def __init__(self, configs: list) -> None:
+        self.configs = list(configs)
+        self.types = [_norm(v.get("type")) for v in self.configs]
+        self.scopes = [_norm(v.get("scope")) or "both" for v in self.configs]
+        self.hub_ids = [_norm(v.get("hub_id")) for v in self.configs]
+        self.patterns = [v.get("pattern") for v in self.configs]
+
+    def __len__(self) -> int:
+        return len(self.configs)
+
+    def __repr__(self) -> str:
+        return repr(self.configs)
+
+
+def _passed() -> dict:
+    return {"valid": True, "violations": []}
+
+
+def _ensure_thread_loop() -> None:
+    """Give the calling thread an event loop once; later calls only read a thread-local flag.
+
+    Loops are per thread: a loop object must not be shared by threads that might run it.
+    """
+    try:
+        asyncio.get_running_loop()
+        # A running loop alone is not cached; the thread may have none once it stops
+        return
+    except RuntimeError:
+        pass
+    try:
+        asyncio.get_event_loop()
+    except RuntimeError:
+        asyncio.set_event_loop(asyncio.new_event_loop())
+    _LOOP_READY.ok = True
 
 
 class GuardrailsHubAdapter:
     def __init__(self) -> None:
         self.available = GUARDRAILS_AVAILABLE
+        # Guard is imported on the first run that needs it and reused afterwards
+        self._guard_cls = None
+        # Per thread: (target, sorted params) -> configured Guard, so equal validators are built
+        # once per worker. Guards keep per-call state (history) and must not validate concurrently
+        self._guards = threading.local()
+        if self.available:
+            _hub_modules()
 
     def is_available(self) -> bool:
         return self.available
 
-    def has_validate(self) -> bool:
+    def preload(self, validators_config: list) -> Dict[Tuple[str, str], Any]:
+        """Resolve validator classes ahead of requests so run() only hits the cache."""
+        resolved: Dict[Tuple[str, str], Any] = {}
+        if not self.available:
+            return resolved
+        for v in validators_config or ():
+            t = _norm(v.get("type"))
+            hub_id = _norm(v.get("hub_id"))
+            resolved[(t, hub_id)] = _resolve_hub_cls(t, hub_id)
+        return resolved
+
+    def _guard_for(self, Guard, target, params: Dict[str, Any]):
+        """Return a Guard using target with params, reusing one this thread built for the same config."""
+        cache = getattr(self._guards, "cache", None)
+        if cache is None:
+            cache = self._guards.cache = {}
         try:
-            from guardrails import Guard  # noqa: F401
-            return True
-        except Exception:
-            return False
+            key = (target, tuple(sorted(params.items())))
+            guard = cache.get(key)
+        except TypeError:
+            # Unhashable param values: build a one-off guard
+            return Guard().use(target, **params)
+        if guard is None:
+            if len(cache) >= _GUARD_CACHE_SIZE:
+                cache.clear()
+            guard = cache[key] = Guard().use(target, **params)
+        return guard
+
+    def has_validate(self) -> bool:
+        global _HAS_VALIDATE
+        if _HAS_VALIDATE is None:
+            try:
+                from guardrails import Guard  # noqa: F401
+                _HAS_VALIDATE = True
+            except Exception:
+                _HAS_VALIDATE = False
+        return _HAS_VALIDATE
 
     # FIX: make `run` a method of the outer class (remove the nested class)
     def run(self, text: str, validators_config: list, scope=None) -> tuple[str, dict]:
-        import logging, importlib
-        lg = logging.getLogger(__name__)
-        lg.setLevel(logging.INFO)
-        lg.info("HubAdapter: input text=%s", text)
-        logging.getLogger("gr_integration.app").info("[hub] adapter received text=%r scope=%s", text, (scope or "both"))
-        lg.info("Guardrails Hub adapter invoked; validators=%s", validators_config)
-
+        return self.run_many([text], validators_config, scope)[0]
+
+    def run_many(self, texts: list, validators_config: list, scope=None, contexts: Optional[list] = None) -> list:
+        """Run one validators_config over several texts; scope filtering and setup happen once.
+
+        contexts, when given, holds one contextvars.Context per text; that text's
+        logging and validation run inside it, so per-request log capture follows it.
+        """
+        if not isinstance(validators_config, ValidatorColumns):
+            validators_config = ValidatorColumns(validators_config or ())
+        active, Guard, early = self._prepare(validators_config, scope)
+        if contexts is None:
+            return [self._run_one(text, validators_config, scope, active, Guard, early) for text in texts]
+        return [
+            ctx.run(self._run_one, text, validators_config, scope, active, Guard, early)
+            for text, ctx in zip(texts, contexts)
+        ]
+
+    def _prepare(self, validators_config: ValidatorColumns, scope):
+        """Return ((columns, active indices), Guard, early-result factory or None) for a run."""
         if not self.available:
-            return text, {}
-
-        # Ensure an asyncio event loop exists to avoid guardrails warnings
-        import asyncio
-        try:
-            asyncio.get_running_loop()
-        except RuntimeError:
+            # Every result carries a canonical "valid"; an unusable adapter blocks nothing
+            return None, None, _passed
+        # Nothing to run: skip loop setup and the Guard import entirely
+        rs = _norm(scope) or "both"
+        if not validators_config:
+            return None, None, _passed
+        cols = validators_config
+        active = [i for i, sc in enumerate(cols.scopes) if sc == "both" or sc == rs]
+        if not active:
+            return None, None, _passed
+
+        # Ensure an asyncio event loop exists to avoid guardrails warnings (once per thread)
+        if not getattr(_LOOP_READY, "ok", False):
+            _ensure_thread_loop()
+
+        Guard = self._guard_cls
+        if Guard is None:
             try:
-                loop = asyncio.get_event_loop()
-            except RuntimeError:
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
+                from guardrails import Guard
+            except Exception as e:
+                _LOG.warning("Guardrails core not available: %s", e)
+                err = str(e)
+                return None, None, lambda: {"valid": False, "error": err, "violations": []}
+            self._guard_cls = Guard
+        return (cols, active), Guard, None
+
+    def _run_one(self, text: str, validators_config: list, scope, active, Guard, early) -> tuple[str, dict]:
+        lg = _LOG
+        lg.info("HubAdapter: input text=%s", text)
+        _APP_LOG.info("[hub] adapter received text=%r scope=%s", text, (scope or "both"))
+        lg.info("Guardrails Hub adapter invoked; validators=%s", validators_config)
+        if early is not None:
+            return text, early()
+        return self._run_active(text, active, Guard)
 
+    def _run_active(self, text: str, active: tuple, Guard) -> tuple[str, dict]:
+        lg = _LOG
+        cols, indices = active
         violations = []
         sanitized_text = text
-        invalid_flags = []  # track per-validator validity booleans
-
-        def _scope_matches(v_scope: str, runtime_scope: str) -> bool:
-            v = (v_scope or "both").strip().lower()
-            rs = (runtime_scope or "both").strip().lower()
-            return v == "both" or v == rs
-
-        def _resolve_hub_cls(v: dict):
-            try:
-                hub_mod = importlib.import_module("guardrails.hub")
-            except Exception:
-                hub_mod = None
-            try:
-                validators_mod = importlib.import_module("guardrails.validators")
-            except Exception:
-                validators_mod = None
-
-            type_raw = (v.get("type") or "").strip().lower()
-            hub_id = (v.get("hub_id") or "").strip().lower()
-
-            def candidates_for(slug_or_type: str):
-                s = (slug_or_type or "").strip().lower().replace("-", "_")
-                last = s.split("/")[-1]
-                base = last.split(":")[-1]
-                return [
-                    f"guardrails.validators.{base}",
-                    f"guardrails.hub.{base}",
-                    base,
-                ]
-
-            names = candidates_for(hub_id) if hub_id else candidates_for(type_raw)
-            for mod in (hub_mod, validators_mod):
-                if mod:
-                    for name in names:
-                        cls = getattr(mod, name, None)
-                        if cls:
-                            lg.info(
-                                "HubAdapter: resolved class=%s from module=%s for type=%s hub_id=%s",
-                                getattr(cls, "__name__", str(cls)),
-                                getattr(mod, "__name__", "(unknown)"),
-                                type_raw or "(none)",
-                                hub_id or "(none)"
-                            )
-                            return cls
-
-            # Direct plugin import fallback (if package is present locally)
-            try:
-                base_slug = (hub_id or type_raw or "").strip().lower().split("/")[-1].replace("-", "_")
-                plugin_mod_name = f"guardrails_grhub_{base_slug}"
-                plugin_mod = importlib.import_module(plugin_mod_name)
-                for name in names:
-                    cls = getattr(plugin_mod, name, None)
-                    if cls:
-                        lg.info(
-                            "HubAdapter: resolved class=%s from plugin=%s for type=%s hub_id=%s",
-                            getattr(cls, "__name__", str(cls)),
-                            plugin_mod_name,
-                            type_raw or "(none)",
-                            hub_id or "(none)"
-                        )
-                        return cls
-            except Exception:
-                pass
-
-            # Dynamic load via Guardrails Hub (requires GUARDRAILS_API_KEY)
-            if hub_mod and (hub_id or type_raw):
-                try:
-                    loader = getattr(hub_mod, "load", None)
-                    if callable(loader):
-                        target = hub_id or f"guardrails/{base_slug}"
-                        loaded = loader(target) or loader(f"hub://{target}")
-                        if loaded:
-                            lg.info(
-                                "HubAdapter: resolved via dynamic hub.load target=%s class=%s",
-                                target,
-                                getattr(loaded, "__name__", str(loaded))
-                            )
-                            return loaded
-                except Exception as e:
-                    lg.warning("Dynamic Hub load failed for %s: %s", (hub_id or type_raw), e)
-            return None
-
-        try:
-            from guardrails import Guard
-        except Exception as e:
-            lg.warning("Guardrails core not available: %s", e)
-            return text, {"error": str(e)}
-
-        runtime_scope = (scope or "both")
-        for v in (validators_config or []):
-            if not _scope_matches(v.get("scope"), runtime_scope):
-                continue
-
-            cls = _resolve_hub_cls(v)
-            params = dict(v.get("params") or {})
-            t = (v.get("type") or "").strip().lower()
-            hub_id = (v.get("hub_id") or "").strip().lower()
+        invalid_flags = bytearray()  # per-validator invalid flags (0/1) without boxing bools
+        violations_append = violations.append
+        flags_append = invalid_flags.append
+
+        for i in indices:
+            v = cols.configs[i]
+            # Pre-normalized columns; reused for class resolution and the regex checks below
+            t = cols.types[i]
+            hub_id = cols.hub_ids[i]
+            cls = _resolve_hub_cls(t, hub_id)
+            raw_params = v.get("params")
+            params = dict(raw_params) if raw_params else {}
 
             # Support regex by type OR hub_id suffix
             if t in {"regex", "regex_match"} or hub_id.endswith(("regex_match", "/regex", "regex")):
-                pattern = v.get("pattern")  or v.get("Pattern") or params.get("pattern") or params.get("regex") or ""
+                pattern = cols.patterns[i] or v.get("Pattern") or params.get("pattern") or params.get("regex") or ""
                 if not pattern:
                     lg.warning("Regex validator missing 'pattern'; skipping. type=%s hub_id=%s", t, hub_id or "(none)")
-                    invalid_flags.append(True)
-                    violations.append({
+                    flags_append(True)
+                    violations_append({
                         "type": (v.get("type") or "unknown"),
                         "scope": (v.get("scope") or "both"),
                         "params": {"on_fail": params.get("on_fail")},
@@ -200,44 +374,41 @@ class GuardrailsHubAdapter:
 
             params.setdefault("on_fail", (v.get("on_fail") or "exception"))
 
-            reserved = {"type", "scope", "hub_id", "pattern", "on_fail", "params"}
-            for k, val in v.items():
-                if k not in reserved and k not in params:
-                    params[k] = val
+            for k in v.keys() - _RESERVED_KEYS - params.keys():
+                params[k] = v[k]
 
             # NEW: resolve target via class or hub_id/type fallback
             target = cls or (v.get("hub_id") or v.get("type"))
             if not target:
                 lg.warning("Hub validator not found: type=%s hub_id=%s", v.get("type"), v.get("hub_id"))
-                violations.append({
+                violations_append({
                     "type": (v.get("type") or "unknown"),
                     "scope": (v.get("scope") or "both"),
                     "params": params,
                     "error": "validator_not_found",
                 })
-                invalid_flags.append(True)
+                flags_append(True)
                 continue
 
             # Only handle local fallback for regex; allow Guard().use for other Hub validators
             if cls is None and isinstance(target, str) and target.startswith("guardrails/"):
                 if t in {"regex", "regex_match"} or hub_id.endswith(("regex_match", "/regex", "regex")):
-                    import re
                     pattern = params.get("pattern") or ""
                     try:
-                        matched = bool(re.search(pattern, sanitized_text))
+                        matched = bool(_compile(pattern).search(sanitized_text))
                     except Exception as re_err:
-                        violations.append({
+                        violations_append({
                             "type": (v.get("type") or "unknown"),
                             "scope": (v.get("scope") or "both"),
                             "params": {"on_fail": params.get("on_fail")},
                             "error": f"validator_regex_compile_error: {re_err}",
                         })
-                        invalid_flags.append(True)
+                        flags_append(True)
                         continue
                     is_valid = bool(matched)
-                    invalid_flags.append(not is_valid)
+                    flags_append(not is_valid)
                     if not is_valid:
-                        violations.append({
+                        violations_append({
                             "type": (v.get("type") or "unknown"),
                             "scope": (v.get("scope") or "both"),
                             "params": {"on_fail": params.get("on_fail")},
@@ -246,7 +417,7 @@ class GuardrailsHubAdapter:
                     lg.info("Local regex fallback executed; pattern=%r matched=%s", pattern, matched)
                     continue
             try:
-                guard = Guard().use(target, **params)
+                guard = self._guard_for(Guard, target, params)
                 lg.info(
                     "Hub Guardrail execution: target=%r, resolved_class=%s, type=%s, hub_id=%s, scope=%s",
                     target,
@@ -256,12 +427,12 @@ class GuardrailsHubAdapter:
                     v.get("scope") or "both"
                 )
                 lg.info("Hub Guardrail params keys=%s", sorted(list(params.keys())))
-                logging.getLogger("gr_integration.app").info(
+                _APP_LOG.info(
                     "[hub] validator params hub_id=%s type=%s scope=%s pattern=%r on_fail=%s",
                     v.get("hub_id") or "(none)", t or "(unknown)", v.get("scope") or "both",
                     params.get("pattern"), params.get("on_fail")
                 )
-                logging.getLogger("gr_integration.app").info(
+                _APP_LOG.info(
                     "[hub] validator input text=%r", sanitized_text
                 )
                 result = guard.validate(sanitized_text)
@@ -288,22 +459,30 @@ class GuardrailsHubAdapter:
                         sanitized_text = result
                 except Exception as parse_err:
                     lg.debug("Result parse issue; keeping original: %s", parse_err)
-                invalid_flags.append(not bool(is_valid))
+                flags_append(not bool(is_valid))
                 if not bool(is_valid):
-                    violations.append({
+                    violations_append({
                         "type": (v.get("type") or "unknown"),
                         "scope": (v.get("scope") or "both"),
                         "params": {"on_fail": params.get("on_fail")},
                         "error": "validator_failed",
                     })
             except Exception as err:
-                violations.append({
+                violations_append({
                     "type": (v.get("type") or "unknown"),
                     "scope": (v.get("scope") or "both"),
                     "params": params,
                     "error": str(err),
                 })
-                invalid_flags.append(params.get("on_fail", "exception") != "noop")
+                flags_append(params.get("on_fail", "exception") != "noop")
 
-        lg.info("Guardrails Hub processed; violations=%d invalids=%d", len(violations), sum(1 for f in invalid_flags if f))
+        lg.info("Guardrails Hub processed; violations=%d invalids=%d", len(violations), sum(invalid_flags))
         return sanitized_text, {"valid": (not any(invalid_flags)), "violations": violations}
+
+
+_SINGLETON = GuardrailsHubAdapter()
+
+
+def get_hub_adapter() -> GuardrailsHubAdapter:
+    """Return the process-wide adapter instance."""
+    return _SINGLETON
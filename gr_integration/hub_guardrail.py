@@ -1,22 +1,43 @@
 # Top of file imports
 import logging
+from types import MappingProxyType
 from typing import Dict, Any
-from .dto import CoreAgentContext
+from .dto import CoreAgentContext, _enum_str, _norm
 from .base_guardrail import Guardrail
 
-HUB_ID_MAP = {
+HUB_ID_MAP = MappingProxyType({
     "regex_match": "guardrails/regex_match",
     "valid_json": "guardrails/valid_json",
-    "valid_url": "guardrails/valid_url",    
+    "valid_url": "guardrails/valid_url",
     "unusual_prompt": "guardrails/unusual_prompt",
     "detect_pii": "guardrails/detect_pii"
+})
+_HUBID_TO_TYPE = MappingProxyType({v: k for k, v in HUB_ID_MAP.items()})
+
+
+_SUFFIX_TO_TYPE = {
+    "regex_match": "regex_match",
+    "valid_json": "valid_json",
+    "valid_url": "valid_url",
+    "unusual_prompt": "unusual_prompt",
+    "detect_pii": "detect_pii",
 }
+_BLOCKLIST_ALIASES = frozenset({"blocklist", "blacklist", "denylist"})
 
 
 def _infer_type_from_hub_id(hub_id: str) -> str:
-    base = (hub_id or "").strip().lower().split("/")[-1]
+    known = _HUBID_TO_TYPE.get(_norm(hub_id))
+    if known:
+        return known
+    base = (hub_id or "").strip().rpartition("/")[2].lower()
     if not base:
         return "unknown"
+    t = _SUFFIX_TO_TYPE.get(base)
+    if t:
+        return t
+    if base in _BLOCKLIST_ALIASES:
+        return "blocklist"
+    # Substring fallback for slugs that are not an exact known suffix
     if "regex_match" in base:
         return "regex_match"
     if "json" in base:
@@ -27,7 +48,7 @@ def _infer_type_from_hub_id(hub_id: str) -> str:
         return "unusual_prompt"
     if "detect_pii" in base:
         return "detect_pii"
-    if any(term in base for term in ["blocklist", "blacklist", "denylist"]):
+    if any(term in base for term in _BLOCKLIST_ALIASES):
         return "blocklist"
     return base
 
@@ -39,9 +60,7 @@ class HubGuardrail(Guardrail):
         on_fail = getattr(self.config, "on_fail", None) or "exception"
         pattern = getattr(self.config, "pattern", None) or ""
         params = getattr(self.config, "params", None) or {}
-        scope_str = (
-            self.config.scope.value if hasattr(self.config.scope, "value") else str(self.config.scope or "both")
-        ).strip().lower()
+        scope_str = _norm(_enum_str(self.config.scope or "both"))
 
         details: Dict[str, Any] = {
             "type": "hub",
@@ -53,8 +72,8 @@ class HubGuardrail(Guardrail):
         }
 
         try:
-            from .hub_adapter import GuardrailsHubAdapter
-            hub = GuardrailsHubAdapter()
+            from .hub_adapter import get_hub_adapter
+            hub = get_hub_adapter()
 
             if not hub.is_available():
                 details["error"] = "guardrails_library_unavailable"
@@ -70,9 +89,7 @@ class HubGuardrail(Guardrail):
             # Fallback to configured type when no hub_id provided
             if not hub_id:
                 t_raw = getattr(self.config, "type", None)
-                t_lower = (t_raw.value if hasattr(t_raw, "value") else str(t_raw or "")).strip().lower()
-                if "." in t_lower:
-                    t_lower = t_lower.split(".")[-1]
+                t_lower = _norm(_enum_str(t_raw)).rpartition(".")[2]
                 if t_lower in {"json"}:
                     validator_type = "valid_json"
                 elif t_lower in {"url"}:
@@ -88,15 +105,14 @@ class HubGuardrail(Guardrail):
                 elif t_lower in {"regex_match", "pii", "blocklist", "valid_json", "valid_url", "competitor_check"}:
                     validator_type = t_lower
 
-            validator_cfg: Dict[str, Any] = {
-                **({"hub_id": hub_id or HUB_ID_MAP.get(
-                    validator_type)} if hub_id or validator_type in HUB_ID_MAP else {}),
-                "type": validator_type,
-                "scope": scope_str,
-                "on_fail": on_fail,
-                **({"pattern": pattern} if validator_type == "regex" else {}),
-                **(params or {}),
-            }
+            validator_cfg: Dict[str, Any] = {"type": validator_type, "scope": scope_str, "on_fail": on_fail}
+            resolved_hub_id = hub_id or HUB_ID_MAP.get(validator_type)
+            if resolved_hub_id:
+                validator_cfg["hub_id"] = resolved_hub_id
+            if validator_type == "regex":
+                validator_cfg["pattern"] = pattern
+            if params:
+                validator_cfg.update(params)
             logging.getLogger(__name__).info(
                 "HubGuardrail: prepared validator_cfg summary type=%s hub_id=%s scope=%s on_fail=%s keys=%s",
                 validator_cfg.get("type"),
@@ -1,14 +1,62 @@
 # Top of file imports
 import logging
-from typing import List, Dict
+from typing import List, Dict, Tuple
 
 from .dto import CoreAgentContext
-from .base_guardrail import Guardrail
+from .base_guardrail import Guardrail, GuardrailConfig
+from .hs_scan import build_database
+from .pii_patterns import _NEEDS_AT, _NEEDS_DIGIT, _PII_ALIASES, _PII_PATTERNS, _combined, find_all
+from .pii_prescreen import luhn_checker, prescreen
+
+try:
+    import re2  # google-re2; optional
+except ImportError:
+    re2 = None
+
+
+def _canonical_types(selected: List[str]) -> Tuple[str, ...]:
+    """Map aliases, drop unknown types and order by pattern priority."""
+    wanted = {_PII_ALIASES.get(t, t) for t in selected}
+    return tuple(t for t in _PII_PATTERNS if t in wanted)
+
+
+def _build_re2_set():
+    """Compile every PII pattern into one RE2 Set so a single DFA pass reports which types occur."""
+    options = re2.Options()
+    options.case_sensitive = False
+    pii_set = re2.Set.SearchSet(options)
+    index: Dict[int, str] = {}
+    for pii_type, source in _PII_PATTERNS.items():
+        index[pii_set.Add(source)] = pii_type
+    pii_set.Compile()
+    return pii_set, index
+
+
+_PII_RE2_SET = None
+_PII_SET_INDEX: Dict[int, str] = {}
+if re2 is not None:
+    try:
+        _PII_RE2_SET, _PII_SET_INDEX = _build_re2_set()
+    except Exception as e:
+        logging.getLogger(__name__).warning("PIIGuardrail: RE2 set unavailable, using re fallback: %s", e)
+
+# Opt-in Hyperscan database over every PII pattern; ids index _PII_HS_TYPES
+_PII_HS_TYPES: Tuple[str, ...] = tuple(_PII_PATTERNS)
+_PII_HS_DB = build_database([_PII_PATTERNS[t] for t in _PII_HS_TYPES])
 
 
 class PIIGuardrail(Guardrail):
-    def validate(self, context: CoreAgentContext, user_input: str) -> str:
-        self._emit_start(context, user_input)
+    DEFAULT_TYPES: List[str] = list(_PII_PATTERNS)
+
+    def __init__(self, config: GuardrailConfig) -> None:
+        super().__init__(config)
+        # Config is fixed for the instance: resolve the selection and compile it once
+        self._selected = self._select_types()
+        self._types = _canonical_types(self._selected)
+        if self._types:
+            _combined(self._types)
+
+    def _select_types(self) -> List[str]:
         # Prefer params toggles over pattern string
         params = getattr(self.config, "params", None) or {}
         selected: List[str] = []
@@ -26,8 +74,60 @@ class PIIGuardrail(Guardrail):
         pattern = getattr(self.config, "pattern", None) or ""
         if not selected:
             selected = [t.strip().lower() for t in pattern.split(",") if t.strip()] or self.DEFAULT_TYPES
+        return selected
 
+    def validate(self, context: CoreAgentContext, user_input: str) -> str:
+        self._emit_start(context, user_input)
+        selected = self._selected
         spans = self._detect(user_input, selected)
         details = {"type": "pii", "matches": spans, "pii_types": selected, "classification": "detect_pii"}
         self._emit_end(context, user_input, user_input, details=details)
         return user_input
+
+    def _detect(self, text: str, selected: List[str]) -> Dict[str, list]:
+        """Return match spans for each selected PII type found in text.
+
+        Spans are columnar: parallel "type", "start", "end" and "value" lists.
+        """
+        starts: List[int] = []
+        ends: List[int] = []
+        kinds: List[str] = []
+        values: List[str] = []
+        spans = {"type": kinds, "start": starts, "end": ends, "value": values}
+        types = self._types if selected is self._selected else _canonical_types(selected)
+        wanted = set(types)
+        has_at, has_digit = prescreen(text)
+        if not has_at:
+            wanted -= _NEEDS_AT
+        if not has_digit:
+            wanted -= _NEEDS_DIGIT
+        # One multi-pattern scan narrows the candidates; spans are only extracted for types that hit
+        if _PII_HS_DB is not None:
+            wanted &= {_PII_HS_TYPES[i] for i, _s, _e in _PII_HS_DB.scan(text.encode())}
+        elif _PII_RE2_SET is not None:
+            wanted &= {_PII_SET_INDEX[i] for i in (_PII_RE2_SET.Match(text) or ())}
+        if len(wanted) != len(types):
+            types = tuple(t for t in types if t in wanted)
+        if not types:
+            return spans
+        found = []
+        if "credit_card" in types:
+            # Cards are scanned on their own: in the combined alternation a Luhn-rejected digit
+            # run would consume the phone numbers inside it
+            types = tuple(t for t in types if t != "credit_card")
+            luhn_ok = luhn_checker(text)
+            found = [span for span in find_all(text, ("credit_card",)) if luhn_ok(span[0], span[1])]
+        if types:
+            others = find_all(text, types)
+            if found:
+                # A valid card keeps priority over the phone/IP spans inside it
+                others = [o for o in others if not any(o[0] < e and s < o[1] for s, e, _k in found)]
+                found = sorted(found + others)
+            else:
+                found = others
+        for start, end, kind in found:
+            kinds.append(kind)
+            starts.append(start)
+            ends.append(end)
+            values.append(text[start:end])
+        return spans
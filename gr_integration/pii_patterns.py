@@ -0,0 +1,38 @@
+# Top of file imports
+import re
+from functools import lru_cache
+from typing import Dict, List, Tuple
+
+from .regex_guardrail import _compile_linear
+
+# Source patterns per PII type. Order is alternation priority in the combined
+# regex, so longer digit runs (credit cards) are tried before phone numbers;
+# PIIGuardrail scans credit cards separately so Luhn rejects do not hide phones.
+_PII_PATTERNS: Dict[str, str] = {
+    "email": r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}",
+    "credit_card": r"\b(?:\d[ -]*?){13,19}\b",
+    "phone_number": r"(?:\+?\d{1,3}[ .-]?)?(?:\(\d{3}\)|\d{3})[ .-]?\d{3}[ .-]?\d{4}\b",
+    "ip_address": r"\b(?:\d{1,3}\.){3}\d{1,3}\b",
+    "url": r"\bhttps?://[^\s]+",
+    "api_key": r"\b(?:sk|pk|api|key)[-_][A-Za-z0-9]{16,}\b",
+}
+_PII_ALIASES: Dict[str, str] = {"phone": "phone_number", "phonenumber": "phone_number", "ip": "ip_address"}
+# Types that cannot match without an '@' / without a digit
+_NEEDS_AT = frozenset({"email"})
+_NEEDS_DIGIT = frozenset({"credit_card", "phone_number", "ip_address"})
+_ALL_TYPES: Tuple[str, ...] = tuple(_PII_PATTERNS)
+
+
+@lru_cache(maxsize=64)
+def _combined(selected: Tuple[str, ...]):
+    """One alternation of named groups so a single scan finds every selected type."""
+    return _compile_linear("|".join(f"(?P<{t}>{_PII_PATTERNS[t]})" for t in selected), re.IGNORECASE)
+
+
+def find_all(text: str, types: Tuple[str, ...] = _ALL_TYPES) -> List[Tuple[int, int, str]]:
+    """Return (start, end, type) spans for the given types, in text order, from one scan."""
+    return [(*m.span(), m.lastgroup) for m in _combined(types).finditer(text)]
+
+
+# Compile the full set at import so the first request does not pay for it
+_combined(_ALL_TYPES)
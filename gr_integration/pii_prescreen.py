@@ -0,0 +1,72 @@
+# Top of file imports
+import re
+from typing import Callable, Tuple
+
+# Numba and numpy are optional; fall back to C-level str/regex checks without them
+try:
+    import numpy as np
+    from numba import njit
+except ImportError:
+    np = None
+    njit = None
+
+_DIGIT_RE = re.compile(r"\d")
+
+if njit is not None:
+    @njit(cache=True)
+    def _has_chars(buf):
+        has_at = False
+        has_digit = False
+        for i in range(buf.size):
+            c = buf[i]
+            if c == 64:
+                has_at = True
+            elif 48 <= c <= 57 or c >= 128:
+                # Non-ASCII bytes may encode Unicode digits that \d matches; stay conservative
+                has_digit = True
+            if has_at and has_digit:
+                break
+        return has_at, has_digit
+
+    @njit(cache=True)
+    def _luhn_buf(buf, start, end):
+        # Walk digits right to left, doubling every second one; separators are skipped
+        total = 0
+        n = 0
+        for i in range(end - 1, start - 1, -1):
+            c = buf[i]
+            if 48 <= c <= 57:
+                d = (c - 48) << (n & 1)
+                total += d - 9 * (d > 9)
+                n += 1
+        return total % 10 == 0
+
+    # Pay the JIT compile cost once at import
+    _has_chars(np.frombuffer(b"warm@up1", np.uint8))
+    _luhn_buf(np.frombuffer(b"4111 1111 1111 1111", np.uint8), 0, 19)
+
+
+def prescreen(text: str) -> Tuple[bool, bool]:
+    """Return (has_at, has_digit) so callers can skip PII types that cannot match."""
+    if njit is not None:
+        return _has_chars(np.frombuffer(text.encode("utf-8", "surrogatepass"), np.uint8))
+    return "@" in text, _DIGIT_RE.search(text) is not None
+
+
+def _luhn_str(s: str) -> bool:
+    total = 0
+    for n, ch in enumerate(ch for ch in reversed(s) if ch.isdecimal()):
+        d = int(ch) << (n & 1)
+        total += d - 9 if d > 9 else d
+    return total % 10 == 0
+
+
+def luhn_checker(text: str) -> Callable[[int, int], bool]:
+    """Return a (start, end) -> bool Luhn check over spans of text.
+
+    ASCII text is encoded once and checked by the JIT-compiled loop when numba is present.
+    """
+    if njit is not None and text.isascii():
+        buf = np.frombuffer(text.encode("ascii"), np.uint8)
+        return lambda start, end: _luhn_buf(buf, start, end)
+    return lambda start, end: _luhn_str(text[start:end])
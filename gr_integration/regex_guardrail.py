@@ -1,21 +1,79 @@
 import re
+from functools import lru_cache
 from typing import List, Dict
 
 from .dto import CoreAgentContext
-from .base_guardrail import Guardrail
+from .base_guardrail import Guardrail, GuardrailConfig
+
+try:
+    import re2  # google-re2; optional linear-time engine
+except ImportError:
+    re2 = None
+
+# re flags that have an RE2 equivalent; anything else goes straight to re
+_RE2_FLAGS = re.IGNORECASE | re.MULTILINE | re.DOTALL
+
+
+@lru_cache(maxsize=512)
+def _compile(pattern: str, flags: int = 0) -> "re.Pattern[str]":
+    """Compile and memoize a regex by (pattern, flags)."""
+    return re.compile(pattern, flags)
+
+
+def _re2_compile(pattern: str, flags: int):
+    options = re2.Options()
+    options.log_errors = False
+    options.case_sensitive = not flags & re.IGNORECASE
+    options.dot_nl = bool(flags & re.DOTALL)
+    return re2.compile("(?m)" + pattern if flags & re.MULTILINE else pattern, options)
+
+
+@lru_cache(maxsize=512)
+def _compile_linear(pattern: str, flags: int = 0):
+    """Compile with google-re2 when available; fall back to re for patterns RE2 rejects.
+
+    RE2 scans in linear time, so pathological inputs cannot trigger backtracking.
+    Note its \\d, \\w and \\b classes are ASCII-only. Raises re.error for invalid patterns.
+    """
+    if re2 is not None and not flags & ~_RE2_FLAGS:
+        try:
+            return _re2_compile(pattern, flags)
+        except re2.error:
+            pass
+    return re.compile(pattern, flags)
+
+
+@lru_cache(maxsize=256)
+def _compile_guardrail_pattern(pattern: str):
+    """Compile a RegexGuardrail pattern; invalid patterns are cached as None."""
+    try:
+        return _compile_linear(pattern, re.IGNORECASE | re.MULTILINE)
+    except re.error:
+        return None
+
+
+def _compile_unicode_pattern(pattern: str):
+    """Stdlib compile of a RegexGuardrail pattern, or None when only RE2 accepts it."""
+    try:
+        return _compile(pattern, re.IGNORECASE | re.MULTILINE)
+    except re.error:
+        return None
 
 
 class RegexGuardrail(Guardrail):
+    def __init__(self, config: GuardrailConfig) -> None:
+        super().__init__(config)
+        pattern = getattr(config, "pattern", None) or ""
+        self._rx = _compile_guardrail_pattern(pattern) if pattern else None
+        # RE2's \b, \w and \d are ASCII-only, so non-ASCII input uses the Unicode-aware re engine
+        self._rx_unicode = (_compile_unicode_pattern(pattern) or self._rx) if self._rx is not None else None
+
     def validate(self, context: CoreAgentContext, user_input: str) -> str:
         self._emit_start(context, user_input)
         matches: List[Dict] = []
-        pattern = getattr(self.config, "pattern", None) or ""
-        if pattern:
-            try:
-                rx = re.compile(pattern, flags=re.IGNORECASE | re.MULTILINE)
-                for m in rx.finditer(user_input):
-                    matches.append({"start": m.start(), "end": m.end(), "value": m.group(0)})
-            except re.error:
-                pass
+        rx = self._rx if user_input.isascii() else self._rx_unicode
+        if rx is not None:
+            for m in rx.finditer(user_input):
+                matches.append({"start": m.start(), "end": m.end(), "value": m.group(0)})
         self._emit_end(context, user_input, user_input, details={"type": "regex", "matches": matches})
         return user_input
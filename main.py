@@ -1,19 +1,63 @@
 # module imports and logger
+import asyncio
+import contextvars
+import functools
+import hashlib
+import itertools
+import json
 import os
-from typing import Any, Dict, List, Optional
+from collections import OrderedDict, deque
+from typing import Any, Dict, List, NamedTuple, Optional
 
 from fastapi import FastAPI, HTTPException
 from fastapi.responses import JSONResponse
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 from dotenv import load_dotenv
+import orjson
 import logging
 from fastapi import Query
-import uuid
 
 # Load environment variables (optional)
 load_dotenv()
 
-app = FastAPI(title="Guardrails Integration API", version="0.1.0")
+log = logging.getLogger("gr_integration.app")
+
+
+class _ORJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson; details and server_logs can be large."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+app = FastAPI(title="Guardrails Integration API", version="0.1.0", default_response_class=_ORJSONResponse)
+
+# Hub adapter is imported once at startup; requests only check the capability flags below
+try:
+    from gr_integration.hub_adapter import ValidatorColumns, get_hub_adapter, read_manifest
+    _HUB = get_hub_adapter()
+    _HUB_IMPORT_ERR: Optional[str] = None
+except Exception as e:
+    _HUB = None
+    _HUB_IMPORT_ERR = str(e)
+    log.error("Hub adapter import failed: %s", e)
+_HUB_AVAILABLE = _HUB is not None and _HUB.is_available()
+_HUB_HAS_VALIDATE = _HUB is not None and _HUB.has_validate()
+
+# Per-request correlation ids: process id plus a counter, no urandom syscall needed
+_PID = os.getpid()
+_REQ_COUNTER = itertools.count()
+
+
+def _reset_request_ids() -> None:
+    # Workers forked after import get their own pid prefix and a fresh counter
+    global _PID, _REQ_COUNTER
+    _PID = os.getpid()
+    _REQ_COUNTER = itertools.count()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_request_ids)
 
 # --------- Models ---------
 
@@ -26,12 +70,23 @@ class ValidatorConfig(BaseModel):
     params: Optional[Dict[str, Any]] = Field(default=None, description="Extra validator parameters")
 
 class ValidateRequest(BaseModel):
-    text: str = Field(..., description="Text to validate")
+    text: str = Field(default="", description="Text to validate ('user_input' is accepted as an alias)")
     scope: Optional[str] = Field(default="both", description="Scope to run validators under")
-    validators: List[ValidatorConfig] = Field(default_factory=list, description="List of validator configurations")
+    # Kept as dicts: UI entries may name the validator ("validator"/"name") instead of giving a type
+    validators: List[Dict[str, Any]] = Field(default_factory=list, description="List of ValidatorConfig-shaped validator configurations")
     agent_context: Optional[Dict[str, Any]] = Field(default=None, description="Optional agent context for local guardrails service")
     use_local_first: Optional[bool] = Field(default=True, description="Run local guardrails service before Hub if available")
 
+    @model_validator(mode="before")
+    @classmethod
+    def _fill_defaults(cls, data: Any) -> Any:
+        # Empty text falls back to user_input; null validators mean none
+        if isinstance(data, dict):
+            data = {**data, "text": data.get("text") or data.get("user_input") or ""}
+            if data.get("validators") is None:
+                data["validators"] = []
+        return data
+
 class ValidateResponse(BaseModel):
     text: str
     valid: bool
@@ -39,243 +94,406 @@ class ValidateResponse(BaseModel):
 
 # --------- Helpers ---------
 
+@functools.lru_cache(maxsize=1)
 def _import_optional_guardrails_api_service():
     """
     Try to import the local guardrails service stack.
-    Returns (service_cls, scope_enum_or_str) or (None, None) if unavailable.
+    Returns (service_instance, dto_module) or (None, None) if unavailable.
+    The outcome is cached, so the import is only attempted once per process.
     """
     try:
+        from gr_integration import dto
         from gr_integration.guardrails_api_service import GuardrailsApiService
-        try:
-            from gr_integration.dto import GuardrailsScope  # type: ignore
-            scope_enum = GuardrailsScope
-        except Exception:
-            scope_enum = None
-        return GuardrailsApiService, scope_enum
+        return GuardrailsApiService(), dto
     except Exception:
         return None, None
 
 
-def _run_hub_validators(text: str, validators: List[ValidatorConfig], scope: str) -> (str, Dict[str, Any]):
+def _run_local_guardrails(service, dto, text: str, validators: List[Dict[str, Any]], scope,
+                          agent_context: Optional[Dict[str, Any]]) -> (str, Dict[str, Any]):
+    """Run the local service (blocking) and return (sanitized_text, details) like the hub path.
+
+    GuardrailsApiService.validate returns the sanitized text, or raises
+    ValueError(message, details) when a validator reports a violation.
+    """
+    guardrails = [
+        dto.AgentGuardrail(
+            id=v.get("id"),
+            type=v.get("type") or "",
+            scope=v.get("scope") or "both",
+            hub_id=v.get("hub_id"),
+            pattern=v.get("pattern"),
+            on_fail=v.get("on_fail") or "exception",
+            params=v.get("params") if isinstance(v.get("params"), dict) else None,
+        )
+        for v in validators
+    ]
+    ctx = agent_context or {}
+    meta = ctx.get("agent_metadata")
+    context = dto.CoreAgentContext(
+        session_id=ctx.get("session_id"),
+        agent_metadata=dto.AgentMetadata(id=meta.get("id")) if isinstance(meta, dict) else None,
+    )
     try:
-        from gr_integration.hub_adapter import GuardrailsHubAdapter
-    except Exception as e:
-        logging.getLogger("gr_integration.app").error("Hub adapter import failed: %s", e)
+        return service.validate(context, guardrails, text, scope), {"valid": True, "violations": []}
+    except ValueError as e:
+        details = e.args[1] if len(e.args) > 1 and isinstance(e.args[1], dict) else {}
+        return text, {**details, "valid": False}
+
+
+class _BatchItem(NamedTuple):
+    key: tuple
+    hub: Any
+    text: str
+    validators_config: List[Dict[str, Any]]
+    scope: str
+    future: asyncio.Future
+    context: contextvars.Context
+
+
+class BatchDispatcher:
+    """Coalesce concurrent hub runs that share validators and scope into one run_many call.
+
+    An idle dispatcher sends a request straight away; while batches are executing,
+    new requests wait up to max_wait_ms so they can join the next one.
+    """
+
+    def __init__(self, max_batch_size: int = 32, max_wait_ms: float = 10.0) -> None:
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: set = set()
+        self._inflight = 0
+
+    async def submit(self, hub, config_key: bytes, text: str, validators_config: List[Dict[str, Any]], scope: str):
+        """Queue text for a batched hub.run_many; config_key must identify validators_config and scope."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._start(loop)
+        key = (id(hub), config_key)
+        future = loop.create_future()
+        # The submitter's context travels with the item so its log capture sees the hub run
+        item = _BatchItem(key, hub, text, validators_config, scope, future, contextvars.copy_context())
+        self._queue.put_nowait(item)
+        return await future
+
+    def _start(self, loop: asyncio.AbstractEventLoop) -> None:
+        # Queues and tasks belong to one loop; a new loop (e.g. a test client) gets its own worker
+        self._loop = loop
+        self._queue = asyncio.Queue()
+        self._inflight = 0
+        # A fresh context so the long-lived worker does not inherit the first request's context vars
+        self._spawn(self._collect(), contextvars.Context())
+
+    def _spawn(self, coro, context=None) -> None:
+        task = self._loop.create_task(coro, context=context)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _collect(self) -> None:
+        queue = self._queue
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                if not queue.empty():
+                    batch.append(queue.get_nowait())
+                    continue
+                timeout = deadline - loop.time()
+                if not self._inflight or timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            groups: Dict[tuple, List[_BatchItem]] = {}
+            for item in batch:
+                # Requests cancelled while queued (e.g. a valid local result won) are not run
+                if not item.future.cancelled():
+                    groups.setdefault(item.key, []).append(item)
+            for items in groups.values():
+                self._inflight += 1
+                self._spawn(self._execute(items))
+
+    async def _execute(self, items: List[_BatchItem]) -> None:
+        try:
+            items = [item for item in items if not item.future.cancelled()]
+            if not items:
+                return
+            first = items[0]
+            results = await asyncio.to_thread(
+                first.hub.run_many,
+                [item.text for item in items],
+                first.validators_config,
+                first.scope,
+                [item.context for item in items],
+            )
+        except Exception as e:
+            for item in items:
+                if not item.future.done():
+                    item.future.set_exception(e)
+        else:
+            for item, result in zip(items, results):
+                if not item.future.done():
+                    item.future.set_result(result)
+        finally:
+            self._inflight -= 1
+
+
+_DISPATCHER = BatchDispatcher()
+
+# LRU of normalized hub configs keyed by _config_key
+_CONFIG_CACHE_SIZE = 512
+_CONFIG_CACHE: "OrderedDict[bytes, List[Dict[str, Any]]]" = OrderedDict()
+
+# Canonical values hit these tables as-is and skip the strip().lower() copies
+_SCOPE_INTERN = {s: s for s in ("both", "input", "output")}
+_TYPE_INTERN = {t: t for t in ("regex", "regex_match", "valid_url", "valid_json", "detect_pii", "pii", "blocklist")}
+_HUB_ID_INTERN = {"guardrails/regex_match": "guardrails/regex_match"}
+
+
+def _lower_field(value: Any, table: Dict[str, str], default: str = "") -> str:
+    if isinstance(value, str):
+        hit = table.get(value)
+        if hit is not None:
+            return hit
+    return str(value or default).strip().lower()
+
+
+def _normalize_validators(validators: List[Dict[str, Any]], run_scope: str) -> List[Dict[str, Any]]:
+    """Turn request validator dicts into hub adapter configs.
+
+    Validators the adapter would skip for run_scope are dropped before any other work.
+    """
+    validators_config: List[Dict[str, Any]] = []
+    for v in validators:
+        scope_raw = _lower_field(v.get("scope"), _SCOPE_INTERN, "both")
+        if scope_raw != "both" and scope_raw != run_scope:
+            continue
+        # Infer type from UI label when missing
+        name_raw = (str(v.get("validator") or v.get("name") or "")).strip().lower()
+        type_raw = _lower_field(v.get("type"), _TYPE_INTERN)
+        if not type_raw:
+            if "regex" in name_raw:
+                type_raw = "regex"
+            elif "valid url" in name_raw or "url" in name_raw:
+                type_raw = "valid_url"
+
+        cfg: Dict[str, Any] = {"type": type_raw, "scope": scope_raw}
+
+        # Default hub_id for known types when missing
+        hub_id_raw = _lower_field(v.get("hub_id"), _HUB_ID_INTERN)
+        if not hub_id_raw and type_raw in {"regex", "regex_match"}:
+            hub_id_raw = "guardrails/regex_match"
+        if hub_id_raw:
+            cfg["hub_id"] = hub_id_raw
+
+        # Strip any surrounding quotes from pattern
+        pattern_val = v.get("pattern")
+        if isinstance(pattern_val, str):
+            pattern_val = pattern_val.strip().strip('"').strip("'")
+
+        # Forward regex pattern for both type and hub_id variants
+        if pattern_val and (
+            type_raw in {"regex", "regex_match"} or
+            hub_id_raw.endswith(("regex_match", "/regex", "regex"))
+        ):
+            cfg["pattern"] = pattern_val
+
+        if v.get("on_fail"):
+            cfg["on_fail"] = v.get("on_fail")
+
+        params = v.get("params") or {}
+        if isinstance(params, dict):
+            for k, val in params.items():
+                cfg[k] = val
+        validators_config.append(cfg)
+    return validators_config
+
+
+def _config_key(validators: List[Dict[str, Any]], scope: str) -> bytes:
+    """Canonical digest of the request validators plus scope; the NUL keeps the two parts apart."""
+    raw = json.dumps(validators, sort_keys=True, default=str).encode()
+    return hashlib.blake2b(raw + b"\0" + scope.encode(), digest_size=16).digest()
+
+
+def _cached_validators_config(validators: List[Dict[str, Any]], scope: str) -> (bytes, Any):
+    """Return (key, normalized configs), normalizing each distinct validators list only once.
+
+    Configs are cached as hub_adapter.ValidatorColumns, so the per-field columns are
+    also built once. Cached configs are shared across requests and must not be mutated.
+    """
+    key = _config_key(validators, scope)
+    validators_config = _CONFIG_CACHE.get(key)
+    if validators_config is None:
+        validators_config = _CONFIG_CACHE[key] = ValidatorColumns(_normalize_validators(validators, scope))
+        if len(_CONFIG_CACHE) > _CONFIG_CACHE_SIZE:
+            _CONFIG_CACHE.popitem(last=False)
+    else:
+        _CONFIG_CACHE.move_to_end(key)
+    return key, validators_config
+
+
+async def _run_hub_validators(text: str, validators: List[Dict[str, Any]], scope: str) -> (str, Dict[str, Any]):
+    if _HUB is None:
         return text, {
             "valid": False,
-            "violations": [{"error": "hub_import_failed", "message": str(e)}],
+            "violations": [{"error": "hub_import_failed", "message": _HUB_IMPORT_ERR}],
         }
-    hub = GuardrailsHubAdapter()
-    if not hub.is_available() or not hub.has_validate():
-        logging.getLogger("gr_integration.app").warning(
-            "Hub unavailable: available=%s has_validate=%s",
-            hub.is_available(), hub.has_validate()
-        )
+    if not _HUB_AVAILABLE or not _HUB_HAS_VALIDATE:
+        log.warning("Hub unavailable: available=%s has_validate=%s", _HUB_AVAILABLE, _HUB_HAS_VALIDATE)
         return text, {
             "valid": False,
             "violations": [{"error": "hub_unavailable", "message": "guardrails-ai not installed or validate not supported"}],
         }
 
-    validators_config: List[Dict[str, Any]] = []
-    for v in validators:
-        # Accept dict-shaped validators from request body
-        if isinstance(v, dict):
-            # Infer type from UI label when missing
-            name_raw = (str(v.get("validator") or v.get("name") or "")).strip().lower()
-            type_raw = (str(v.get("type") or "")).strip().lower()
-            if not type_raw:
-                if "regex" in name_raw:
-                    type_raw = "regex"
-                elif "valid url" in name_raw or "url" in name_raw:
-                    type_raw = "valid_url"
-
-            scope_raw = (str(v.get("scope") or "both")).strip().lower()
-            cfg: Dict[str, Any] = {"type": type_raw, "scope": scope_raw}
-
-            # Default hub_id for known types when missing
-            hub_id_raw = (str(v.get("hub_id") or "")).strip().lower()
-            if not hub_id_raw and type_raw in {"regex", "regex_match"}:
-                hub_id_raw = "guardrails/regex_match"
-            if hub_id_raw:
-                cfg["hub_id"] = hub_id_raw
-
-            # Strip any surrounding quotes from pattern
-            pattern_val = v.get("pattern")
-            if isinstance(pattern_val, str):
-                pattern_val = pattern_val.strip().strip('"').strip("'")
-
-            # Forward regex pattern for both type and hub_id variants
-            if pattern_val and (
-                type_raw in {"regex", "regex_match"} or
-                hub_id_raw.endswith(("regex_match", "/regex", "regex"))
-            ):
-                cfg["pattern"] = pattern_val
-
-            if v.get("on_fail"):
-                cfg["on_fail"] = v.get("on_fail")
-
-            params = v.get("params") or {}
-            if isinstance(params, dict):
-                for k, val in params.items():
-                    cfg[k] = val
-        else:
-            # Fallback for Pydantic model instances, if present
-            cfg: Dict[str, Any] = {
-                "type": (getattr(v, "type", "") or "").strip().lower(),
-                "scope": (getattr(v, "scope", "both") or "both").strip().lower(),
-            }
-            hub_id_val = getattr(v, "hub_id", None)
-            if hub_id_val:
-                cfg["hub_id"] = hub_id_val
-
-            pattern_val = getattr(v, "pattern", None)
-            if isinstance(pattern_val, str):
-                pattern_val = pattern_val.strip().strip('"').strip("'")
-            if pattern_val and (
-                cfg["type"] in {"regex", "regex_match"} or
-                str(hub_id_val or "").strip().lower().endswith(("regex_match", "/regex", "regex"))
-            ):
-                cfg["pattern"] = pattern_val
-
-            on_fail_val = getattr(v, "on_fail", None)
-            if on_fail_val:
-                cfg["on_fail"] = on_fail_val
-
-            params_val = getattr(v, "params", None)
-            if isinstance(params_val, dict):
-                for k, val in params_val.items():
-                    cfg[k] = val
-        validators_config.append(cfg)
+    scope = scope or "both"
+    config_key, validators_config = _cached_validators_config(validators, scope)
 
     # Inspect what reaches the adapter (helps you verify hub_id/pattern)
-    logging.getLogger("gr_integration.app").info("Hub validators_config=%s", validators_config)
-    logging.getLogger("gr_integration.app").info("Hub adapter input text=%r scope=%s", text, (scope or "both"))
+    log.info("Hub validators_config=%s", validators_config)
+    log.info("Hub adapter input text=%r scope=%s", text, scope)
 
-    sanitized_text, details = hub.run(text, validators_config=validators_config, scope=(scope or "both"))
+    sanitized_text, details = await _DISPATCHER.submit(_HUB, config_key, text, validators_config, scope)
     return sanitized_text, details or {}
 
 def _is_valid(details: Dict[str, Any]) -> bool:
-    try:
-        if "valid" in details:
-            return bool(details["valid"])
-        # Any explicit error should be considered invalid
-        if isinstance(details, dict) and details.get("error"):
-            return False
-        violations = details.get("violations", [])
-        if isinstance(violations, list) and len(violations) > 0:
-            return False
-        return True
-    except Exception:
-        return True
+    # Adapter results and the hub error paths above always carry a canonical "valid" bool
+    return bool(details.get("valid", True)) if details else True
 
 # --------- Routes ---------
 
 @app.get("/health")
-def health() -> JSONResponse:
-    return JSONResponse({"status": "ok"})
+def health() -> Dict[str, str]:
+    return {"status": "ok"}
 
-class _ListHandler(logging.Handler):
-    # Collect log records as formatted strings in-memory
-    def __init__(self):
-        super().__init__(level=logging.INFO)
-        self.records: List[str] = []
-        self.setFormatter(logging.Formatter("%(asctime)s | %(levelname)s | %(name)s | %(message)s"))
+# Per-request log capture: a bounded deque while include_logs is set, None otherwise
+_SERVER_LOG_LIMIT = 200
+_LOG_BUFFER: contextvars.ContextVar[Optional[deque]] = contextvars.ContextVar("log_buf", default=None)
+_CAPTURED_LOGGERS = ("gr_integration.app", "gr_integration.hub_adapter")
 
-    def emit(self, record: logging.LogRecord) -> None:
-        try:
-            self.records.append(self.format(record))
-        except Exception:
-            # Avoid breaking the request on logging errors
-            pass
+
+class _BufferFilter(logging.Filter):
+    # Copy records into the current request's buffer; never drops a record
+    def filter(self, record: logging.LogRecord) -> bool:
+        buf = _LOG_BUFFER.get()
+        if buf is not None and record.levelno >= logging.INFO:
+            try:
+                # No asctime: skips localtime/strftime per record; lines keep request order
+                buf.append(f"{record.levelname} | {record.name} | {record.getMessage()}")
+            except Exception:
+                # Avoid breaking the request on logging errors
+                pass
+        return True
+
+
+# Installed once; filters stay on the loggers instead of per-request handlers
+_BUFFER_FILTER = _BufferFilter()
+for _name in _CAPTURED_LOGGERS:
+    logging.getLogger(_name).addFilter(_BUFFER_FILTER)
 
 @app.post("/validate", response_model=ValidateResponse)
-@app.post("/validate")
 async def validate(
-    payload: dict,
+    req: ValidateRequest,
     include_logs: bool = Query(default=False, description="Include server-side guardrails logs in response"),
 ):
     # Per-request log capture
-    capturer = _ListHandler()
-    target_loggers = ["gr_integration.app", "gr_integration.hub_adapter"]
-    for name in target_loggers:
-        logging.getLogger(name).addHandler(capturer)
+    log_token = _LOG_BUFFER.set(deque(maxlen=_SERVER_LOG_LIMIT)) if include_logs else None
 
     try:
-        scope = str(payload.get("scope", "both")).strip().lower()
-        validators = payload.get("validators", []) or []
-        user_input = payload.get("text") or payload.get("user_input") or ""
-        hub_ids = [ (v.get("hub_id") or "").strip() for v in validators if isinstance(v, dict) and v.get("hub_id") ]
-
-        validation_id = uuid.uuid4().hex[:8]
-        use_local_first = payload.get("use_local_first", True)
-        logging.getLogger("gr_integration.app").info(
-            f"[start] id={validation_id} scope={scope} validators={len(validators)} use_local_first={use_local_first} hub_ids={hub_ids or '(none)'}"
-        )
-        logging.getLogger("gr_integration.app").info(
-            f"[payload] id={validation_id} scope={scope} text={user_input!r}"
-        )
-
-        # Optionally run local guardrails first
+        scope = str(req.scope).strip().lower()
+        validators = req.validators
+        user_input = req.text
+        # No validators: skip both pipelines and their per-request logging.
+        # Blank text still runs, since a validator may reject it
+        if not validators:
+            details = {"valid": True, "violations": []}
+            if include_logs:
+                details["server_logs"] = list(_LOG_BUFFER.get())
+            return ValidateResponse(text=user_input, valid=True, details=details)
+        validation_id = f"{_PID:x}-{next(_REQ_COUNTER):x}"
+        use_local_first = req.use_local_first
+
+        # Local guardrails run in a worker thread while the Hub path starts alongside;
+        # a valid local result wins and the Hub task is cancelled
+        local_task = None
+        local_state = "disabled"
         if use_local_first:
-            GuardrailsApiService, scope_enum = _import_optional_guardrails_api_service()
-            if GuardrailsApiService and scope_enum:
+            local_service, dto = _import_optional_guardrails_api_service()
+            local_state = "unavailable"
+            if local_service is not None:
                 try:
-                    sanitized_text, details = GuardrailsApiService.validate(
-                        text=user_input,
-                        validators=validators,
-                        scope=scope_enum(scope),
-                        agent_context=payload.get("agent_context"),
-                    )
-                    valid = _is_valid(details)
-                    logging.getLogger("gr_integration.app").info(f"[local] result id={validation_id} valid={valid}")
-                    if valid:
-                        logging.getLogger("gr_integration.app").info(f"[local] completed id={validation_id}")
-                        if include_logs:
-                            details = details or {}
-                            details["server_logs"] = capturer.records[-200:]
-                        return ValidateResponse(text=sanitized_text, valid=True, details=details)
+                    local_task = asyncio.create_task(asyncio.to_thread(
+                        _run_local_guardrails, local_service, dto, user_input, validators,
+                        dto.GuardrailsScope(scope), req.agent_context,
+                    ))
+                    local_state = "running"
                 except Exception as e:
-                    logging.getLogger("gr_integration.app").error(f"[local] error id={validation_id} msg={e}")
-            else:
-                logging.getLogger("gr_integration.app").info(f"[local] unavailable id={validation_id} -> switching to Hub")
-        else:
-            logging.getLogger("gr_integration.app").info(f"[hub] local-first disabled id={validation_id}")
-
-        # Run hub validators
-        logging.getLogger("gr_integration.app").info(
-            f"[hub] running id={validation_id} scope={scope} validators={len(validators)} hub_ids={hub_ids or '(none)'}"
-        )
-        sanitized_text, details = _run_hub_validators(user_input, validators, scope)
+                    log.error("[local] error id=%s msg=%s", validation_id, e)
+                    local_state = "error"
+        hub_task = asyncio.create_task(_run_hub_validators(user_input, validators, scope))
+
+        # One record per phase; the fields also ride in `extra` for structured formatters
+        phase = {"validation_id": validation_id, "scope": scope}
+        if log.isEnabledFor(logging.INFO):
+            hub_ids = [(v.get("hub_id") or "").strip() for v in validators if v.get("hub_id")]
+            log.info(
+                "[start] id=%s scope=%s validators=%d local=%s hub_ids=%s text=%r",
+                validation_id, scope, len(validators), local_state, hub_ids or "(none)", user_input,
+                extra={**phase, "n_validators": len(validators), "local": local_state, "hub_ids": hub_ids},
+            )
+
+        if local_task is not None:
+            try:
+                sanitized_text, details = await local_task
+                valid = _is_valid(details)
+                log.info(
+                    "[local] result id=%s valid=%s", validation_id, valid,
+                    extra={**phase, "pipeline": "local", "valid": valid},
+                )
+                if valid:
+                    hub_task.cancel()
+                    if include_logs:
+                        details = details or {}
+                        details["server_logs"] = list(_LOG_BUFFER.get())
+                    return ValidateResponse(text=sanitized_text, valid=True, details=details)
+            except Exception as e:
+                log.error("[local] error id=%s msg=%s", validation_id, e)
+
+        sanitized_text, details = await hub_task
         valid = _is_valid(details)
-        logging.getLogger("gr_integration.app").info(f"[hub] result id={validation_id} valid={valid}")
+        log.info("[hub] result id=%s valid=%s", validation_id, valid, extra={**phase, "pipeline": "hub", "valid": valid})
 
         # Attach logs when requested
         if include_logs:
             details = details or {}
-            details["server_logs"] = capturer.records[-200:]
+            details["server_logs"] = list(_LOG_BUFFER.get())
 
         if not valid:
             raise HTTPException(status_code=422, detail={"message": "Guardrail validation failed", **details})
 
-        logging.getLogger("gr_integration.app").info(f"[hub] completed id={validation_id}")
         return ValidateResponse(text=sanitized_text, valid=True, details=details)
     finally:
-        # Ensure we detach the per-request handler
-        for name in target_loggers:
-            try:
-                logging.getLogger(name).removeHandler(capturer)
-            except Exception:
-                pass
-    # Pass the original payload to your service (or use the extracted fields above if that’s what it expects)
-    result = await GuardrailsApiService.validate(payload)
+        if log_token is not None:
+            _LOG_BUFFER.reset(log_token)
 
 
 # App startup module
 
+_LOG_FORMATTER = logging.Formatter("%(asctime)s | %(levelname)s | %(name)s | %(message)s")
+# Set once handlers are wired; repeated startups (reloads, multiple TestClients) skip the rewiring
+_LOGGING_CONFIGURED = False
+
+
 def _configure_guardrails_logging() -> None:
+    global _LOGGING_CONFIGURED
+    if _LOGGING_CONFIGURED:
+        return
     handler = logging.StreamHandler()
     handler.setLevel(logging.INFO)
-    handler.setFormatter(logging.Formatter("%(asctime)s | %(levelname)s | %(name)s | %(message)s"))
+    handler.setFormatter(_LOG_FORMATTER)
 
     target_names = [
         "gr_integration.app",
@@ -294,8 +512,33 @@ def _configure_guardrails_logging() -> None:
         root.addHandler(handler)
     if root.level > logging.INFO:
         root.setLevel(logging.INFO)
+    _LOGGING_CONFIGURED = True
 
 @app.on_event("startup")
 async def _startup_logging():
     _configure_guardrails_logging()
-    logging.getLogger("gr_integration.app").info("Guardrails logging configured")
\ No newline at end of file
+    log.info("Guardrails logging configured")
+
+async def _preload_hub_validators(manifest: str) -> None:
+    try:
+        resolved = await asyncio.to_thread(_HUB.preload, read_manifest(manifest))
+    except Exception as e:
+        log.warning("Hub validator preload failed: %s", e)
+        return
+    log.info(
+        "Hub validators preloaded: %d/%d resolved", sum(1 for c in resolved.values() if c), len(resolved)
+    )
+
+
+# Held so the background preload is not garbage-collected while it runs
+_PRELOAD_TASK: Optional[asyncio.Task] = None
+
+@app.on_event("startup")
+async def _start_hub_preload():
+    # Resolve the installed Hub validator classes ahead of the first request, without
+    # holding up startup on hub.load; classes not resolved yet are resolved on demand
+    global _PRELOAD_TASK
+    manifest = os.path.join(os.path.dirname(os.path.abspath(__file__)), "hub_validators.txt")
+    if _HUB is None or not os.path.exists(manifest):
+        return
+    _PRELOAD_TASK = asyncio.create_task(_preload_hub_validators(manifest))
@@ -1,8 +1,13 @@
 from typing import Any, Dict
+import asyncio
+import logging
 import types
 import sys
 
+import httpx
 from fastapi.testclient import TestClient
+
+import main
 from main import app
 
 client = TestClient(app)
@@ -27,7 +32,7 @@ def _install_fake_guard(monkeypatch, result: Any = ("", True)):
             # If a tag param is passed, append it to text to help assertions
             tag = self.params.get("tag")
             if isinstance(result, tuple):
-                new_text = text + (f" [{tag}]" if tag else " [sanitized]")
+                new_text = text + (f" [{tag}]" if tag else "") + " [sanitized]"
                 return (new_text, True)
             elif isinstance(result, dict):
                 new_text = text + (f" [{tag}]" if tag else "")
@@ -38,12 +43,18 @@ def _install_fake_guard(monkeypatch, result: Any = ("", True)):
 
     fake_module = types.ModuleType("guardrails")
     fake_module.Guard = FakeGuard
-    sys.modules["guardrails"] = fake_module
+    monkeypatch.setitem(sys.modules, "guardrails", fake_module)
 
-    # Ensure adapter methods report availability
-    from guardrails.hub_adapter import GuardrailsHubAdapter
-    monkeypatch.setattr(GuardrailsHubAdapter, "is_available", lambda self: True)
-    monkeypatch.setattr(GuardrailsHubAdapter, "has_validate", lambda self: True)
+    # main reads the hub capability flags once at import; point it at an available adapter
+    from gr_integration import hub_adapter
+    # Resolve every validator to a stand-in class so runs go through FakeGuard, not the regex fallback
+    monkeypatch.setattr(hub_adapter, "_resolve_hub_cls", lambda type_raw, hub_id: FakeGuard)
+    hub = hub_adapter.GuardrailsHubAdapter()
+    hub.available = True
+    monkeypatch.setattr(main, "_HUB", hub)
+    monkeypatch.setattr(main, "_HUB_AVAILABLE", True)
+    monkeypatch.setattr(main, "_HUB_HAS_VALIDATE", True)
+    monkeypatch.setattr(main, "_DISPATCHER", main.BatchDispatcher())
 
 
 def test_health_ok():
@@ -108,4 +119,153 @@ def test_scope_filtering_applies_only_matching(monkeypatch):
     data = resp.json()
     # Only IN tag should be appended because runtime scope is 'input'
     assert data["text"].endswith(" [IN] [sanitized]") or data["text"].endswith(" [sanitized] [IN]")
-    assert "OUT" not in data["text"]
\ No newline at end of file
+    assert "OUT" not in data["text"]
+
+class _RecordingHub:
+    """Stands in for the hub adapter: records run_many batches and logs per text."""
+
+    def __init__(self):
+        self.calls = []
+
+    def run_many(self, texts, validators_config, scope=None, contexts=None):
+        self.calls.append(list(texts))
+        if scope == "fail":
+            raise RuntimeError("hub down")
+
+        def one(text):
+            logging.getLogger("gr_integration.hub_adapter").info("fake hub saw %s", text)
+            return text + " [hub]", {"valid": True, "violations": []}
+
+        contexts = contexts or [None] * len(texts)
+        return [ctx.run(one, text) if ctx else one(text) for text, ctx in zip(texts, contexts)]
+
+
+def test_dispatcher_batches_concurrent_requests_with_same_config():
+    hub = _RecordingHub()
+    dispatcher = main.BatchDispatcher()
+
+    async def submit_all():
+        return await asyncio.gather(*[
+            dispatcher.submit(hub, b"cfg", f"t{i}", [{"type": "toxic_language"}], "both") for i in range(5)
+        ])
+
+    results = asyncio.run(submit_all())
+    assert [text for text, _ in results] == [f"t{i} [hub]" for i in range(5)]
+    assert hub.calls == [["t0", "t1", "t2", "t3", "t4"]]
+
+
+def test_dispatcher_exception_fails_only_its_group():
+    hub = _RecordingHub()
+    dispatcher = main.BatchDispatcher()
+
+    async def submit_all():
+        return await asyncio.gather(
+            dispatcher.submit(hub, b"bad", "a", [], "fail"),
+            dispatcher.submit(hub, b"ok", "b", [], "both"),
+            dispatcher.submit(hub, b"bad", "c", [], "fail"),
+            return_exceptions=True,
+        )
+
+    bad_a, ok_b, bad_c = asyncio.run(submit_all())
+    assert isinstance(bad_a, RuntimeError) and isinstance(bad_c, RuntimeError)
+    assert ok_b == ("b [hub]", {"valid": True, "violations": []})
+    assert sorted(hub.calls) == [["a", "c"], ["b"]]
+
+
+def test_include_logs_stay_per_request_within_a_batch(monkeypatch):
+    hub = _RecordingHub()
+    monkeypatch.setattr(main, "_HUB", hub)
+    monkeypatch.setattr(main, "_HUB_AVAILABLE", True)
+    monkeypatch.setattr(main, "_HUB_HAS_VALIDATE", True)
+    monkeypatch.setattr(main, "_DISPATCHER", main.BatchDispatcher())
+
+    async def post_all():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as ac:
+            return await asyncio.gather(*[
+                ac.post(
+                    "/validate?include_logs=true",
+                    json={"text": text, "validators": [{"type": "toxic_language"}], "use_local_first": False},
+                )
+                for text in ("first", "second")
+            ])
+
+    responses = asyncio.run(post_all())
+    assert len(hub.calls) == 1
+    for resp, text, other in zip(responses, ("first", "second"), ("second", "first")):
+        logs = resp.json()["details"]["server_logs"]
+        assert any(f"fake hub saw {text}" in line for line in logs)
+        assert not any(f"fake hub saw {other}" in line for line in logs)
+
+
+def test_dispatcher_skips_requests_cancelled_before_running():
+    hub = _RecordingHub()
+    dispatcher = main.BatchDispatcher()
+
+    async def submit_then_cancel():
+        task = asyncio.ensure_future(dispatcher.submit(hub, b"cfg", "cancelme", [], "both"))
+        await asyncio.sleep(0)
+        task.cancel()
+        kept = await dispatcher.submit(hub, b"cfg", "kept", [], "both")
+        return task, kept
+
+    task, kept = asyncio.run(submit_then_cancel())
+    assert task.cancelled()
+    assert kept == ("kept [hub]", {"valid": True, "violations": []})
+    assert hub.calls == [["kept"]]
+
+
+def test_blank_text_still_runs_validators_and_no_validators_short_circuits(monkeypatch):
+    hub = _RecordingHub()
+    monkeypatch.setattr(main, "_HUB", hub)
+    monkeypatch.setattr(main, "_HUB_AVAILABLE", True)
+    monkeypatch.setattr(main, "_HUB_HAS_VALIDATE", True)
+    monkeypatch.setattr(main, "_DISPATCHER", main.BatchDispatcher())
+
+    resp = client.post(
+        "/validate",
+        json={"text": "  ", "validators": [{"type": "regex", "pattern": r"\S"}], "use_local_first": False},
+    )
+    assert resp.status_code == 200
+    assert hub.calls == [["  "]]
+
+    resp = client.post("/validate", json={"text": "hello", "validators": [], "use_local_first": False})
+    assert resp.status_code == 200
+    assert resp.json() == {"text": "hello", "valid": True, "details": {"valid": True, "violations": []}}
+    assert hub.calls == [["  "]]
+
+
+def test_valid_local_result_cancels_hub_task(monkeypatch):
+    import gr_integration.guardrails_api_service as api_service
+
+    # Local service sees no hub, so only the local guardrails decide
+    no_hub = types.SimpleNamespace(is_available=lambda: False, has_validate=lambda: False)
+    monkeypatch.setattr(api_service, "get_hub_adapter", lambda: no_hub)
+    hub_state = {}
+
+    async def never_finishing_hub(text, validators, scope):
+        hub_state["started"] = True
+        try:
+            await asyncio.Event().wait()
+        except asyncio.CancelledError:
+            hub_state["cancelled"] = True
+            raise
+
+    monkeypatch.setattr(main, "_run_hub_validators", never_finishing_hub)
+
+    async def post():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as ac:
+            # Bounded: if the local result does not win, the request would wait on the hub forever
+            resp = await asyncio.wait_for(ac.post(
+                "/validate",
+                json={"text": "hello there", "validators": [{"type": "blocklist", "pattern": "secret"}]},
+            ), timeout=5)
+        await asyncio.sleep(0)
+        return resp
+
+    resp = asyncio.run(post())
+    assert resp.status_code == 200
+    assert resp.json()["text"] == "hello there"
+    assert resp.json()["valid"] is True
+    assert hub_state == {"started": True, "cancelled": True}
@@ -0,0 +1,25 @@
+from gr_integration.blocklist_guardrail import BlocklistGuardrail
+from gr_integration.dto import AgentGuardrail, CoreAgentContext
+
+
+def _matches(words, text, use_automaton=True):
+    guardrail = BlocklistGuardrail(AgentGuardrail(type="blocklist", pattern=words))
+    if not use_automaton:
+        guardrail._ac = None
+    captured = {}
+    guardrail._emit_end = lambda context, before, after, details=None: captured.update(details)
+    guardrail.validate(CoreAgentContext(), text)
+    return [m["value"] for m in captured["matches"]]
+
+
+def test_regex_path_word_boundaries_are_unicode_aware():
+    assert _matches("cat", "caté écat", use_automaton=False) == []
+    assert _matches("cat", "un cat é", use_automaton=False) == ["cat"]
+
+
+def test_automaton_path_folds_non_ascii_letters_like_re_ignorecase():
+    # Long s, dotless i and the Kelvin sign all match ASCII letters under re.IGNORECASE
+    text = "\u017fex, \u0131t and \u212aey"
+    expected = ["\u017fex", "\u0131t", "\u212aey"]
+    assert _matches("sex, it, key", text, use_automaton=False) == expected
+    assert _matches("sex, it, key", text) == expected
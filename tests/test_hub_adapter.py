@@ -2,10 +2,11 @@ from typing import Any, Dict
 import types
 import sys
 
-from guardrails.hub_adapter import GuardrailsHubAdapter
+from gr_integration import hub_adapter
+from gr_integration.hub_adapter import GuardrailsHubAdapter
 
 
-def _install_fake_guard(result: Any = ("", True)):
+def _install_fake_guard(monkeypatch, result: Any = ("", True)):
     """
     Install a fake 'guardrails' module whose Guard returns 'result' from validate.
     """
@@ -34,15 +35,16 @@ def _install_fake_guard(result: Any = ("", True)):
 
     fake_module = types.ModuleType("guardrails")
     fake_module.Guard = FakeGuard
-    sys.modules["guardrails"] = fake_module
+    monkeypatch.setitem(sys.modules, "guardrails", fake_module)
+    # Resolve every validator to a stand-in class so runs go through FakeGuard, not the regex fallback
+    monkeypatch.setattr(hub_adapter, "_resolve_hub_cls", lambda type_raw, hub_id: FakeGuard)
 
 
 def test_run_tuple_result_parses_sanitized_text_and_valid(monkeypatch):
-    _install_fake_guard(result=("ignored", True))
+    _install_fake_guard(monkeypatch, result=("ignored", True))
     adapter = GuardrailsHubAdapter()
-    # Force availability
-    monkeypatch.setattr(adapter, "is_available", lambda: True)
-    monkeypatch.setattr(adapter, "has_validate", lambda: True)
+    # Force availability; run() checks the attribute, not is_available()
+    monkeypatch.setattr(adapter, "available", True)
 
     text, details = adapter.run(
         "hello",
@@ -55,10 +57,9 @@ def test_run_tuple_result_parses_sanitized_text_and_valid(monkeypatch):
 
 
 def test_run_dict_result_with_violations(monkeypatch):
-    _install_fake_guard(result={"valid": False, "violations": [{"type": "test"}]})
+    _install_fake_guard(monkeypatch, result={"valid": False, "violations": [{"type": "test"}]})
     adapter = GuardrailsHubAdapter()
-    monkeypatch.setattr(adapter, "is_available", lambda: True)
-    monkeypatch.setattr(adapter, "has_validate", lambda: True)
+    monkeypatch.setattr(adapter, "available", True)
 
     text, details = adapter.run(
         "hello",
@@ -71,10 +72,9 @@ def test_run_dict_result_with_violations(monkeypatch):
 
 
 def test_run_respects_scope(monkeypatch):
-    _install_fake_guard(result=("ignored", True))
+    _install_fake_guard(monkeypatch, result=("ignored", True))
     adapter = GuardrailsHubAdapter()
-    monkeypatch.setattr(adapter, "is_available", lambda: True)
-    monkeypatch.setattr(adapter, "has_validate", lambda: True)
+    monkeypatch.setattr(adapter, "available", True)
 
     text, _ = adapter.run(
         "hello",
@@ -84,4 +84,49 @@ def test_run_respects_scope(monkeypatch):
         ],
         scope="input",
     )
-    assert "IN" in text and "OUT" not in text
\ No newline at end of file
+    assert "IN" in text and "OUT" not in text
+
+def test_run_returns_valid_when_no_validator_matches_scope(monkeypatch):
+    _install_fake_guard(monkeypatch, result=("ignored", True))
+    adapter = GuardrailsHubAdapter()
+    monkeypatch.setattr(adapter, "available", True)
+
+    text, details = adapter.run(
+        "hello",
+        validators_config=[{"type": "regex", "scope": "output", "pattern": "h", "tag": "OUT"}],
+        scope="input",
+    )
+    assert text == "hello"
+    assert details == {"valid": True, "violations": []}
+
+    text, details = adapter.run("hello", validators_config=[], scope="input")
+    assert text == "hello" and details == {"valid": True, "violations": []}
+
+
+def test_run_reports_invalid_when_guard_import_fails(monkeypatch):
+    # A guardrails module without Guard makes the lazy import fail
+    monkeypatch.setitem(sys.modules, "guardrails", types.ModuleType("guardrails"))
+    adapter = GuardrailsHubAdapter()
+    monkeypatch.setattr(adapter, "available", True)
+
+    text, details = adapter.run("hello", validators_config=[{"type": "toxic_language"}], scope="both")
+    assert text == "hello"
+    assert details["valid"] is False
+    assert details["violations"] == [] and details["error"]
+
+
+def test_resolve_does_not_cache_hub_load_errors(monkeypatch):
+    import gr_integration.hub_adapter as hub_adapter
+
+    attempts = []
+
+    def failing_load(target):
+        attempts.append(target)
+        raise RuntimeError("network down")
+
+    monkeypatch.setattr(hub_adapter, "_HUB_MODULES", (types.SimpleNamespace(load=failing_load), None))
+    monkeypatch.setattr(hub_adapter, "_RESOLVE_CACHE", {})
+
+    assert hub_adapter._resolve_hub_cls("", "acme/flaky") is None
+    assert hub_adapter._resolve_hub_cls("", "acme/flaky") is None
+    assert len(attempts) == 2 and hub_adapter._RESOLVE_CACHE == {}
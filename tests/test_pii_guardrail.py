@@ -0,0 +1,22 @@
+from gr_integration.dto import AgentGuardrail
+from gr_integration.pii_guardrail import PIIGuardrail
+
+
+def test_luhn_rejected_digit_run_still_reports_phone_numbers():
+    guardrail = PIIGuardrail(AgentGuardrail(type="pii"))
+    text = "phones: 555-123-4567 555-987-6543"
+
+    spans = guardrail._detect(text, guardrail._selected)
+
+    assert spans["type"] == ["phone_number", "phone_number"]
+    assert spans["value"] == ["555-123-4567", "555-987-6543"]
+
+
+def test_valid_card_keeps_priority_over_digits_inside_it():
+    guardrail = PIIGuardrail(AgentGuardrail(type="pii"))
+    text = "card 4111 1111 1111 1111 and 555-123-4567"
+
+    spans = guardrail._detect(text, guardrail._selected)
+
+    assert spans["type"] == ["credit_card", "phone_number"]
+    assert spans["value"] == ["4111 1111 1111 1111", "555-123-4567"]
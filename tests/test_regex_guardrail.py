@@ -0,0 +1,20 @@
+from gr_integration.dto import AgentGuardrail, CoreAgentContext
+from gr_integration.regex_guardrail import RegexGuardrail
+
+
+def _matches(pattern, text):
+    guardrail = RegexGuardrail(AgentGuardrail(type="regex", pattern=pattern))
+    captured = {}
+    guardrail._emit_end = lambda context, before, after, details=None: captured.update(details)
+    guardrail.validate(CoreAgentContext(), text)
+    return [m["value"] for m in captured["matches"]]
+
+
+def test_unicode_classes_follow_re_semantics_on_non_ascii_text():
+    assert _matches(r"\bcat\b", "caté écat") == []
+    assert _matches(r"\w+", "café") == ["café"]
+    assert _matches(r"\d+", "order ٣٤") == ["٣٤"]
+
+
+def test_ascii_text_matches_as_before():
+    assert _matches(r"\bcat\b", "the Cat sat; category") == ["Cat"]